@@ -0,0 +1,129 @@
+"""Per-element overhead of a chained `where`/`select` pipeline.
+
+Compares a fused and a compiled `iterable-extensions` pipeline against the same
+pipeline written as nested generators (the unfused behaviour) and as a hand-written
+generator.
+
+Run with:
+    python benchmarks/fusion.py
+"""
+
+import collections
+import timeit
+
+from iterable_extensions import F, compile, select, where
+
+N = 1_000_000
+REPEAT = 5
+
+source = list(range(N))
+
+
+def p1(x: int) -> bool:
+    return x % 3 != 0
+
+
+def s1(x: int) -> int:
+    return x + 1
+
+
+def p2(x: int) -> bool:
+    return x % 5 != 0
+
+
+def s2(x: int) -> int:
+    return 2 * x
+
+
+def p3(x: int) -> bool:
+    return x > 10
+
+
+def hand_written():
+    for x in source:
+        if not p1(x):
+            continue
+        x = s1(x)
+        if not p2(x):
+            continue
+        x = s2(x)
+        if not p3(x):
+            continue
+        yield x
+
+
+def nested():
+    iterator = (x for x in source if p1(x))
+    iterator = map(s1, iterator)
+    iterator = (x for x in iterator if p2(x))
+    iterator = map(s2, iterator)
+    return (x for x in iterator if p3(x))
+
+
+def fused():
+    return iter(
+        source
+        | where[int](p1)
+        | select[int, int](s1)
+        | where[int](p2)
+        | select[int, int](s2)
+        | where[int](p3)
+    )
+
+
+plan = compile(
+    where[int](p1),
+    select[int, int](s1),
+    where[int](p2),
+    select[int, int](s2),
+    where[int](p3),
+)
+
+
+def compiled():
+    return iter(source | plan)
+
+
+# The same pipeline, with its predicates and selectors inlined into the compiled loop
+inlined_plan = compile(
+    where(F % 3 != 0),
+    select(F + 1),
+    where(F % 5 != 0),
+    select(2 * F),
+    where(F > 10),
+)
+
+
+def compiled_inlined():
+    return iter(source | inlined_plan)
+
+
+def consume(factory) -> float:
+    return min(
+        timeit.repeat(
+            lambda: collections.deque(factory(), maxlen=0),
+            number=1,
+            repeat=REPEAT,
+        )
+    )
+
+
+if __name__ == "__main__":
+    results = {
+        name: consume(factory)
+        for name, factory in [
+            ("hand-written generator", hand_written),
+            ("nested generators", nested),
+            ("fused pipeline", fused),
+            ("compiled pipeline", compiled),
+            ("compiled, inlined", compiled_inlined),
+        ]
+    }
+
+    baseline = results["hand-written generator"]
+
+    for name, seconds in results.items():
+        print(
+            f"{name:<24} {seconds * 1e9 / N:8.1f} ns/element "
+            f"({seconds / baseline:.2f}x hand-written)"
+        )
@@ -0,0 +1,73 @@
+"""Latency of a `where`/`select` pipeline applied to small inputs.
+
+For inputs of a few dozen elements, building the pipeline on each call (extension
+objects, closures, intermediate iterables) can cost more than processing the elements.
+Compares chaining the extension methods on each call against a prebuilt `Pipeline`,
+with a list comprehension as the baseline.
+
+Run with:
+    python benchmarks/latency.py
+"""
+
+import statistics
+import time
+
+from iterable_extensions import F, Pipeline, select, to_list, where
+
+SIZES = [5, 50]
+CALLS = 100_000
+
+
+def comprehension(source: list[int]) -> list[str]:
+    return [str(x) for x in source if x % 2 == 0]
+
+
+def chained(source: list[int]) -> list[str]:
+    return source | where[int](lambda x: x % 2 == 0) | select[int, str](str) | to_list()
+
+
+pipeline = (
+    Pipeline() | where[int](lambda x: x % 2 == 0) | select[int, str](str) | to_list()
+)
+
+
+def prebuilt(source: list[int]) -> list[str]:
+    return source | pipeline
+
+
+inlined_pipeline = Pipeline() | where(F % 2 == 0) | select[int, str](str) | to_list()
+
+
+def prebuilt_inlined(source: list[int]) -> list[str]:
+    return source | inlined_pipeline
+
+
+def measure(func, source: list[int]) -> list[int]:
+    """Duration of each call, in nanoseconds."""
+    durations = []
+    for _ in range(CALLS):
+        start = time.perf_counter_ns()
+        func(source)
+        durations.append(time.perf_counter_ns() - start)
+
+    return durations
+
+
+if __name__ == "__main__":
+    for size in SIZES:
+        source = list(range(size))
+        print(f"{size} elements:")
+
+        for name, func in [
+            ("list comprehension", comprehension),
+            ("chained per call", chained),
+            ("prebuilt pipeline", prebuilt),
+            ("prebuilt, inlined", prebuilt_inlined),
+        ]:
+            assert func(source) == comprehension(source)
+
+            durations = measure(func, source)
+            p50 = statistics.median(durations)
+            p99 = statistics.quantiles(durations, n=100)[98]
+
+            print(f"  {name:<20} p50 {p50 / 1e3:6.2f} us    p99 {p99 / 1e3:6.2f} us")
@@ -0,0 +1,388 @@
+"""Throughput, per-element overhead and peak memory of each extension method.
+
+Every extension in `iterable_extensions.__all__` is measured against the equivalent code
+written with builtins, `itertools` or generator expressions, for a range of input sizes
+and source types (list, range, generator and dict view). Results are written as JSON,
+so that they can be compared across versions.
+
+Run with:
+    python benchmarks/suite.py --output results.json
+    python benchmarks/suite.py --sizes 10,1000,100000000 --only where,select
+"""
+
+import argparse
+import builtins
+import collections
+import datetime
+import functools
+import itertools
+import json
+import platform
+import sys
+import timeit
+import tracemalloc
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any
+
+import iterable_extensions
+from iterable_extensions import (
+    F,
+    Pipeline,
+    any,
+    cache,
+    chunk,
+    compile,
+    count,
+    distinct,
+    first,
+    first_or_none,
+    group_by,
+    last,
+    last_or_none,
+    max,
+    min,
+    order_by,
+    order_by_descending,
+    parallel_select,
+    replay,
+    select,
+    select_batch,
+    single,
+    single_or_none,
+    take,
+    threaded_select,
+    to_dictionary,
+    to_list,
+    where,
+)
+
+DEFAULT_SIZES = [10, 1_000, 100_000, 1_000_000]
+
+# Extensions that start a process pool on each iteration are too slow for the largest
+# sizes to be of interest
+MAX_SIZE_CONCURRENT = 100_000
+
+# Not an extension method by itself. Covered by the `where`/`select` cases on NumPy
+# arrays in `test_numpy.py`, and by the `F` expressions in the `compile` cases. `explain`
+# and `profile` only inspect pipelines, and are not meant for hot paths.
+NOT_MEASURED = {"Expression", "F", "explain", "profile", "structure", "vectorized"}
+
+
+def is_even(x: int) -> bool:
+    return x % 2 == 0
+
+
+def never(x: int) -> bool:
+    return x < 0
+
+
+def double(x: int) -> int:
+    return 2 * x
+
+
+def double_batch(batch: list[int]) -> list[int]:
+    return [2 * x for x in batch]
+
+
+def modulo(x: int) -> int:
+    return x % 100
+
+
+def negate(x: int) -> int:
+    return -x
+
+
+def consume(result: Any) -> None:
+    """Iterates lazily evaluated results to the end."""
+    if isinstance(result, Iterable) and not isinstance(result, (list, dict)):
+        collections.deque(result, maxlen=0)
+
+
+def consume_groups(result: Iterable[Any]) -> None:
+    for group in result:
+        consume(group)
+
+
+def baseline_cache(source: Iterable[int]) -> None:
+    cached = list(source)
+    consume(iter(cached))
+    consume(iter(cached))
+
+
+def extension_cache(source: Iterable[int]) -> None:
+    cached = source | cache()
+    consume(cached)
+    consume(cached)
+
+
+def baseline_replay(source: Iterable[int]) -> None:
+    replayed = list(source) if isinstance(source, Iterator) else source
+    consume(iter(replayed))
+    consume(iter(replayed))
+
+
+def extension_replay(source: Iterable[int]) -> None:
+    replayed = source | replay()
+    consume(replayed)
+    consume(replayed)
+
+
+def baseline_group_by(source: Iterable[int]) -> None:
+    groups = collections.defaultdict(list)
+    for x in source:
+        groups[modulo(x)].append(x)
+
+
+compiled = compile(where(F % 2 == 0), select(2 * F), to_list())
+pipeline = Pipeline() | where(F % 2 == 0) | select(2 * F) | to_list()
+
+# Per extension: the extension method applied to a source, and the equivalent baseline
+CASES: dict[
+    str, tuple[Callable[[Iterable[int]], Any], Callable[[Iterable[int]], Any]]
+] = {
+    "any": (
+        lambda source: source | any[int](never),
+        lambda source: builtins.any(never(x) for x in source),
+    ),
+    "cache": (extension_cache, baseline_cache),
+    "chunk": (
+        lambda source: consume(source | chunk(100)),
+        lambda source: consume(itertools.batched(source, 100)),
+    ),
+    "compile": (
+        lambda source: source | compiled,
+        lambda source: [2 * x for x in source if x % 2 == 0],
+    ),
+    "count": (
+        lambda source: source | count(),
+        lambda source: sum(1 for _ in source),
+    ),
+    "distinct": (
+        lambda source: consume(source | select[int, int](modulo) | distinct()),
+        lambda source: consume(dict.fromkeys(map(modulo, source))),
+    ),
+    "first": (
+        lambda source: source | first(),
+        lambda source: next(iter(source)),
+    ),
+    "first_or_none": (
+        lambda source: source | first_or_none(),
+        lambda source: next(iter(source), None),
+    ),
+    "group_by": (
+        lambda source: consume_groups(source | group_by[int, int](modulo)),
+        baseline_group_by,
+    ),
+    "last": (
+        lambda source: source | last(),
+        lambda source: collections.deque(source, maxlen=1).pop(),
+    ),
+    "last_or_none": (
+        lambda source: source | last_or_none(),
+        lambda source: collections.deque(source, maxlen=1).pop(),
+    ),
+    "max": (
+        lambda source: source | max(),
+        lambda source: builtins.max(source),
+    ),
+    "min": (
+        lambda source: source | min(),
+        lambda source: builtins.min(source),
+    ),
+    "order_by": (
+        lambda source: consume(source | order_by[int, int](negate)),
+        lambda source: consume(iter(sorted(source, key=negate))),
+    ),
+    "order_by_descending": (
+        lambda source: consume(source | order_by_descending[int, int](negate)),
+        lambda source: consume(iter(sorted(source, key=negate, reverse=True))),
+    ),
+    "parallel_select": (
+        lambda source: consume(
+            source | parallel_select[int, int](double, max_workers=2, chunk_size=1000)
+        ),
+        lambda source: consume(map(double, source)),
+    ),
+    "Pipeline": (
+        lambda source: source | pipeline,
+        lambda source: [2 * x for x in source if x % 2 == 0],
+    ),
+    "replay": (extension_replay, baseline_replay),
+    "select": (
+        lambda source: consume(source | select[int, int](double)),
+        lambda source: consume(map(double, source)),
+    ),
+    "select_batch": (
+        lambda source: consume(source | select_batch[int, int](double_batch, 1000)),
+        lambda source: consume(
+            itertools.chain.from_iterable(
+                map(double_batch, map(list, itertools.batched(source, 1000)))
+            )
+        ),
+    ),
+    "single": (
+        lambda source: source | where[int](lambda x: x == 0) | single(),
+        lambda source: [x for x in source if x == 0][0],
+    ),
+    "single_or_none": (
+        lambda source: source | where[int](lambda x: x == 0) | single_or_none(),
+        lambda source: next(iter([x for x in source if x == 0]), None),
+    ),
+    "take": (
+        lambda source: consume(source | take(10)),
+        lambda source: consume(itertools.islice(source, 10)),
+    ),
+    "threaded_select": (
+        lambda source: consume(
+            source | threaded_select[int, int](double, max_workers=4, chunk_size=1000)
+        ),
+        lambda source: consume(map(double, source)),
+    ),
+    "to_dictionary": (
+        lambda source: source | to_dictionary[int, int, int](negate, double),
+        lambda source: {negate(x): double(x) for x in source},
+    ),
+    "to_list": (
+        lambda source: source | to_list(),
+        lambda source: list(source),
+    ),
+    "where": (
+        lambda source: consume(source | where[int](is_even)),
+        lambda source: consume(filter(is_even, source)),
+    ),
+}
+
+# Per source type: a function creating a fresh source of the given size
+SOURCES: dict[str, Callable[[int], Callable[[], Iterable[int]]]] = {
+    "list": lambda size: functools.partial(lambda items: items, list(range(size))),
+    "range": lambda size: functools.partial(range, size),
+    "generator": lambda size: lambda: (x for x in range(size)),
+    # Values rather than keys: a keys view is set-like, so `|` would be set union
+    "dict_view": lambda size: functools.partial(
+        lambda items: items.values(), dict(zip(range(size), range(size)))
+    ),
+}
+
+
+def measure_time(
+    func: Callable[[Iterable[int]], Any], source: Callable[[], Any]
+) -> float:
+    """The shortest duration of a single call, in seconds."""
+    timer = timeit.Timer(lambda: func(source()))
+    number, _ = timer.autorange()
+
+    return builtins.min(timer.repeat(repeat=3, number=number)) / number
+
+
+def measure_memory(
+    func: Callable[[Iterable[int]], Any], source: Callable[[], Any]
+) -> int:
+    """The peak memory allocated during a single call, in bytes. The source itself is
+    created beforehand, and thus not included, except for generators."""
+    items = source()
+
+    tracemalloc.start()
+    try:
+        func(items)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return peak
+
+
+def run(
+    names: list[str], sizes: list[int], source_types: list[str]
+) -> list[dict[str, Any]]:
+    results = []
+
+    for name, size, source_type in itertools.product(names, sizes, source_types):
+        if (
+            name in ("parallel_select", "threaded_select")
+            and size > MAX_SIZE_CONCURRENT
+        ):
+            continue
+
+        extension, baseline = CASES[name]
+        source = SOURCES[source_type](size)
+
+        result: dict[str, Any] = {
+            "extension": name,
+            "size": size,
+            "source": source_type,
+        }
+
+        for label, func in [("extension", extension), ("baseline", baseline)]:
+            seconds = measure_time(func, source)
+
+            result[f"{label}_seconds"] = seconds
+            result[f"{label}_ns_per_element"] = seconds * 1e9 / size
+            result[f"{label}_elements_per_second"] = size / seconds
+            result[f"{label}_peak_bytes"] = measure_memory(func, source)
+
+        result["overhead"] = result["extension_seconds"] / result["baseline_seconds"]
+        results.append(result)
+
+        print(
+            f"{name:<20} {source_type:<10} {size:>11,} "
+            f"{result['extension_ns_per_element']:10.1f} ns/element "
+            f"({result['overhead']:5.2f}x baseline), "
+            f"peak {result['extension_peak_bytes'] / 1e6:8.2f} MB "
+            f"(baseline {result['baseline_peak_bytes'] / 1e6:8.2f} MB)",
+            file=sys.stderr,
+        )
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=(__doc__ or "").partition("\n")[0])
+    parser.add_argument(
+        "--sizes",
+        default=",".join(map(str, DEFAULT_SIZES)),
+        help="Comma-separated input sizes.",
+    )
+    parser.add_argument(
+        "--sources",
+        default=",".join(SOURCES),
+        help="Comma-separated source types.",
+    )
+    parser.add_argument(
+        "--only",
+        default=None,
+        help="Comma-separated extensions to measure. Defaults to all.",
+    )
+    parser.add_argument("--output", default=None, help="Path of the JSON results.")
+    args = parser.parse_args()
+
+    measured = [
+        name for name in iterable_extensions.__all__ if name not in NOT_MEASURED
+    ]
+    missing = set(measured) - set(CASES)
+    if missing:
+        raise SystemExit(f"No benchmark for: {', '.join(sorted(missing))}.")
+
+    names = args.only.split(",") if args.only else measured
+
+    report = {
+        "version": iterable_extensions.__version__,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "timestamp": datetime.datetime.now(datetime.UTC).isoformat(),
+        "results": run(
+            names,
+            [int(size) for size in args.sizes.split(",")],
+            args.sources.split(","),
+        ),
+    }
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,14 @@
 from importlib.metadata import PackageNotFoundError, version
 
+from .compiler import Pipeline, compile
+from .expressions import Expression, F, structure
 from .iterable_extensions import (
     any,
+    cache,
+    chunk,
     count,
     distinct,
+    explain,
     first,
     first_or_none,
     group_by,
@@ -13,13 +18,20 @@ from .iterable_extensions import (
     min,
     order_by,
     order_by_descending,
+    parallel_select,
+    replay,
     select,
+    select_batch,
     single,
     single_or_none,
+    take,
+    threaded_select,
     to_dictionary,
     to_list,
+    vectorized,
     where,
 )
+from .profiling import profile
 
 try:
     __version__ = version("iterable_extensions")
@@ -27,9 +39,16 @@ except PackageNotFoundError:
     __version__ = "noinstall"
 
 __all__ = [
+    "Expression",
+    "F",
+    "Pipeline",
     "any",
+    "cache",
+    "chunk",
+    "compile",
     "count",
     "distinct",
+    "explain",
     "first",
     "first_or_none",
     "group_by",
@@ -39,10 +58,18 @@ __all__ = [
     "min",
     "order_by",
     "order_by_descending",
+    "parallel_select",
+    "profile",
+    "replay",
     "select",
+    "select_batch",
     "single",
     "single_or_none",
+    "structure",
+    "take",
+    "threaded_select",
     "to_dictionary",
     "to_list",
+    "vectorized",
     "where",
 ]
@@ -0,0 +1,531 @@
+import heapq
+import itertools
+import operator
+import pickle
+import tempfile
+import threading
+import zlib
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from typing import Any, cast
+
+PICKLE_PROTOCOL = 5
+
+REPLAY_CHUNK_SIZE = 1_000
+"""Number of elements per chunk in a `ReplayBuffer`."""
+
+SPILL_CHUNK_SIZE = 1_000
+"""Number of elements per chunk of a sorted run or partition spilled by
+`external_sorted` and `hash_grouped`. While reading them back, one chunk per run or
+partition is held in memory."""
+
+PARTITIONS = 16
+"""Number of partitions `hash_grouped` spills to, per level of partitioning."""
+
+MAX_PARTITION_DEPTH = 4
+"""Number of levels of partitioning after which `hash_grouped` groups a partition in
+memory, however large. Reached only if a few keys have most of the elements."""
+
+
+class SpillFile[T]:
+    """Append-only sequence of pickled chunks of elements, stored in an anonymous
+    temporary file that is removed when closed or garbage collected.
+
+    Args:
+        compress: Whether to compress the chunks with zlib.
+    """
+
+    def __init__(self, compress: bool = False):
+        self._file = tempfile.TemporaryFile()
+        self._compress = compress
+        self._lock = threading.Lock()
+        self._offsets: list[tuple[int, int]] = []
+        self._end = 0
+
+    def __len__(self) -> int:
+        """The number of chunks in the file."""
+        return len(self._offsets)
+
+    def append(self, chunk: list[T]) -> None:
+        """Appends a chunk to the file. If the chunk cannot be pickled, the error is
+        propagated and the file is left unchanged."""
+        data = pickle.dumps(chunk, protocol=PICKLE_PROTOCOL)
+        if self._compress:
+            data = zlib.compress(data, level=1)
+
+        with self._lock:
+            self._file.seek(self._end)
+            self._file.write(data)
+
+            self._offsets.append((self._end, len(data)))
+            self._end += len(data)
+
+    def read(self, index: int) -> list[T]:
+        """Reads the chunk at the given index."""
+        offset, size = self._offsets[index]
+
+        with self._lock:
+            self._file.seek(offset)
+            data = self._file.read(size)
+
+        if self._compress:
+            data = zlib.decompress(data)
+
+        return pickle.loads(data)
+
+    def __iter__(self) -> Iterator[T]:
+        for index in range(len(self._offsets)):
+            yield from self.read(index)
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __del__(self) -> None:
+        # Close explicitly rather than leaving it to the file object's finalizer,
+        # which warns about the unclosed file
+        file = getattr(self, "_file", None)
+        if file is not None:
+            file.close()
+
+
+class ReplayBuffer[T](Iterable[T]):
+    """Makes a one-shot iterator, such as a generator or file object, reusable.
+
+    Elements are buffered as they are first read from the source, so that each
+    subsequent iteration replays them. Iterators running concurrently share the buffer.
+
+    Beyond `max_elements` elements, the buffer is either spilled to disk, or discarded.
+    Once discarded, the iterator that read beyond the limit continues on the source,
+    and any other iteration raises a `RuntimeError`.
+
+    Args:
+        source: The one-shot iterator.
+        max_elements: Number of elements to keep in memory. None for unlimited.
+        spill: Whether to spill the elements beyond `max_elements` to disk, instead of
+            discarding the buffer. Elements must then be picklable; if they are not, the
+            buffer is discarded and the error propagated.
+        compress: Whether to compress the spilled elements with zlib.
+        chunk_size: Number of elements per chunk.
+    """
+
+    def __init__(
+        self,
+        source: Iterator[T],
+        max_elements: int | None = None,
+        spill: bool = False,
+        compress: bool = False,
+        chunk_size: int = REPLAY_CHUNK_SIZE,
+    ):
+        self._source = source
+        self._max_elements = max_elements
+        self._spill = spill
+        self._compress = compress
+        self._chunk_size = chunk_size
+
+        self._lock = threading.Lock()
+        # Full chunks, either in memory, or by their index in the spill file
+        self._chunks: list[list[T] | int] = []
+        self._pending: list[T] = []
+        self._count = 0
+        self._complete = False
+        self._discarded = False
+        self._file: SpillFile[T] | None = None
+
+    def __iter__(self) -> Iterator[T]:
+        if self._discarded:
+            raise _discarded_error()
+
+        if self._complete and self._file is None:
+            # Everything is in memory
+            chunks = cast(list[list[T]], self._chunks)
+
+            return itertools.chain(itertools.chain.from_iterable(chunks), self._pending)
+
+        return self._replay()
+
+    def _replay(self) -> Iterator[T]:
+        index = 0
+
+        while True:
+            # Iterators that are ahead of the buffer skip straight to reading the source
+            if index < self._count:
+                chunks = self._chunks
+                pending = self._pending
+                chunk_index, position = divmod(index, self._chunk_size)
+
+                if self._discarded:
+                    raise _discarded_error()
+
+                if chunk_index < len(chunks):
+                    chunk = chunks[chunk_index]
+                    if isinstance(chunk, int):
+                        assert self._file is not None
+                        chunk = self._file.read(chunk)
+
+                    remaining = chunk[position:]
+
+                    yield from remaining
+                    index += len(remaining)
+                    continue
+
+                if chunk_index == len(chunks) and position < len(pending):
+                    yield pending[position]
+                    index += 1
+                    continue
+
+            with self._lock:
+                if self._discarded:
+                    raise _discarded_error()
+
+                if index < self._count:
+                    # Filled by another iterator in the meantime
+                    continue
+
+                if self._complete:
+                    return
+
+                # Reading in batches avoids taking the lock per element. The batch size
+                # grows with the number of elements read so far, such that the source is
+                # never read more than an eighth ahead of what has been requested.
+                size = min(self._count // 8 + 1, self._chunk_size)
+
+                batch: list[T] = []
+                error: Exception | None = None
+
+                try:
+                    # Appended one by one, to keep the elements read before an error
+                    for element in itertools.islice(self._source, size):
+                        batch.append(element)
+                except Exception as e:
+                    error = e
+                else:
+                    self._complete = len(batch) < size
+
+                stored = self._store(batch)
+
+            yield from batch
+            index += len(batch)
+
+            if error is not None:
+                raise error
+
+            if not stored:
+                # Discarded: this iterator is the only one left to read the source
+                yield from self._source
+                return
+
+    def _store(self, elements: list[T]) -> bool:
+        """Adds elements to the buffer. Returns False if the buffer was discarded
+        instead, because it would exceed `max_elements` without spilling."""
+        count = self._count + len(elements)
+
+        if (
+            not self._spill
+            and self._max_elements is not None
+            and count > self._max_elements
+        ):
+            self._discard()
+            return False
+
+        self._count = count
+
+        while elements:
+            room = self._chunk_size - len(self._pending)
+            self._pending.extend(elements[:room])
+            elements = elements[room:]
+
+            if len(self._pending) >= self._chunk_size:
+                try:
+                    self._flush()
+                except BaseException:
+                    self._discard()
+                    raise
+
+        return True
+
+    def _flush(self) -> None:
+        """Moves the full pending chunk to the buffer, spilling it if needed."""
+        chunk: list[T] | int = self._pending
+        in_memory = (len(self._chunks) + 1) * self._chunk_size
+
+        if self._max_elements is not None and in_memory > self._max_elements:
+            if self._file is None:
+                self._file = SpillFile(self._compress)
+
+            self._file.append(self._pending)
+            chunk = len(self._file) - 1
+
+        self._chunks.append(chunk)
+        self._pending = []
+
+    def _discard(self) -> None:
+        self._discarded = True
+        self._chunks = []
+        self._pending = []
+
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def _discarded_error() -> RuntimeError:
+    return RuntimeError(
+        "The elements of the one-shot source exceeded max_elements, and can no longer "
+        "be replayed."
+    )
+
+
+def _read_chunks[T](spill: SpillFile[T], start: int, stop: int) -> Iterator[T]:
+    for index in range(start, stop):
+        yield from spill.read(index)
+
+
+def external_sorted[T](
+    decorated: Iterable[tuple[Any, T]],
+    reverse: bool,
+    run_size: int,
+    compress: bool = False,
+) -> Iterator[tuple[Any, T]]:
+    """Sorts (key, element) pairs by key, holding no more than `run_size` pairs in
+    memory at a time.
+
+    Runs of `run_size` pairs are sorted in memory and spilled to disk, and merged lazily
+    while iterating. The last run is kept in memory. The sort is stable.
+
+    Args:
+        decorated: The (key, element) pairs. Keys and elements must be picklable if
+            there are more than `run_size` pairs.
+        reverse: Whether to sort in descending order.
+        run_size: Number of pairs per run.
+        compress: Whether to compress the spilled runs with zlib.
+    """
+    iterator = iter(decorated)
+    key = operator.itemgetter(0)
+
+    spill: SpillFile[tuple[Any, T]] | None = None
+    runs: list[Iterator[tuple[Any, T]]] = []
+
+    try:
+        while True:
+            run = list(itertools.islice(iterator, run_size))
+            run.sort(key=key, reverse=reverse)
+
+            if len(run) < run_size:
+                break
+
+            if spill is None:
+                spill = SpillFile(compress)
+
+            start = len(spill)
+            for batch in itertools.batched(run, SPILL_CHUNK_SIZE):
+                spill.append(list(batch))
+
+            # Released before reading the next run, to hold only one at a time
+            del run
+            runs.append(_read_chunks(spill, start, len(spill)))
+
+        if not runs:
+            yield from run
+            return
+
+        # Runs are merged in the order they were read, which keeps the sort stable
+        yield from heapq.merge(*runs, run, key=key, reverse=reverse)
+    finally:
+        if spill is not None:
+            spill.close()
+
+
+class _Partitions[T: tuple[Any, ...]]:
+    """Hash-partitions tuples by one of their fields to `PARTITIONS` spill files,
+    buffering a chunk per file.
+
+    Args:
+        field: The index of the field to partition by.
+        depth: The level of partitioning, salting the hash of the field.
+        compress: Whether to compress the spill files with zlib.
+    """
+
+    def __init__(self, field: int, depth: int, compress: bool):
+        self._field = field
+        self._depth = depth
+        self.files = [SpillFile[T](compress) for _ in range(PARTITIONS)]
+        self._buffers: list[list[T]] = [[] for _ in range(PARTITIONS)]
+
+    def write(self, items: Iterable[T]) -> None:
+        field = self._field
+        depth = self._depth
+        buffers = self._buffers
+
+        for item in items:
+            index = hash((depth, item[field])) % PARTITIONS
+            buffer = buffers[index]
+            buffer.append(item)
+
+            if len(buffer) >= SPILL_CHUNK_SIZE:
+                self.files[index].append(buffer)
+                buffers[index] = []
+
+    def flush(self) -> None:
+        """Writes the remaining buffered tuples."""
+        for file, buffer in zip(self.files, self._buffers):
+            if buffer:
+                file.append(buffer)
+
+        self._buffers = [[] for _ in range(PARTITIONS)]
+
+    def close(self) -> None:
+        for file in self.files:
+            file.close()
+
+
+def hash_grouped[T](
+    decorated: Iterable[tuple[Any, T]],
+    max_elements: int,
+    compress: bool = False,
+    depth: int = 0,
+) -> Iterator[tuple[Any, list[T]]]:
+    """Groups (key, element) pairs by key, holding no more than about `max_elements`
+    elements in memory, apart from the groups themselves.
+
+    Pairs are grouped in memory until `max_elements` is exceeded. The groups so far and
+    the remaining pairs are then hash-partitioned by key to disk, and each partition is
+    grouped in turn (grace hash). Partitions that exceed `max_elements` themselves, e.g.
+    due to skewed keys, are partitioned again with a different hash.
+
+    A single group is never partitioned, as it is held in memory entirely when produced
+    anyway. Nor is a partition that partitioning failed to split, as its keys most
+    likely belong to a single group, or a few large ones.
+
+    Groups are produced in order of first occurrence of their key if nothing is spilled,
+    and otherwise in an arbitrary order.
+
+    Args:
+        decorated: The (key, element) pairs. Keys must be hashable, and keys and
+            elements must be picklable if there are more than `max_elements` pairs.
+        max_elements: Number of elements to hold in memory before spilling.
+        compress: Whether to compress the spilled partitions with zlib.
+        depth: The level of partitioning, salting the hash of the keys.
+    """
+    iterator = iter(decorated)
+    groups: defaultdict[Any, list[T]] = defaultdict(list)
+
+    for count, (key, element) in enumerate(iterator, start=1):
+        groups[key].append(element)
+
+        if count > max_elements and len(groups) > 1 and depth < MAX_PARTITION_DEPTH:
+            break
+    else:
+        yield from groups.items()
+        return
+
+    partitions = _Partitions[tuple[Any, T]](0, depth, compress)
+
+    try:
+        partitions.write(
+            (key, element) for key, elements in groups.items() for element in elements
+        )
+        groups.clear()
+        partitions.write(iterator)
+        partitions.flush()
+
+        # If nothing was split, partitioning again is unlikely to split it either, and
+        # the partition is grouped in memory rather than written once more
+        split = sum(1 for partition in partitions.files if len(partition)) > 1
+        next_depth = depth + 1 if split else MAX_PARTITION_DEPTH
+
+        for partition in partitions.files:
+            if len(partition):
+                yield from hash_grouped(
+                    iter(partition), max_elements, compress, next_depth
+                )
+
+            # Released as soon as it has been grouped
+            partition.close()
+    finally:
+        partitions.close()
+
+
+def _spilled[T](items: Iterable[T], compress: bool) -> SpillFile[T]:
+    """A spill file holding `items`, written in chunks."""
+    file = SpillFile[T](compress)
+
+    for batch in itertools.batched(items, SPILL_CHUNK_SIZE):
+        file.append(list(batch))
+
+    return file
+
+
+def hash_distinct[T](
+    indexed: Iterable[tuple[int, T]],
+    max_elements: int,
+    ordered: bool = True,
+    compress: bool = False,
+    depth: int = 0,
+) -> Iterator[tuple[int, T]]:
+    """Of (index, element) pairs in order of index, the first occurrence of each
+    element, holding no more than `max_elements` distinct elements in memory.
+
+    Elements are tracked in memory, and their first occurrences produced right away,
+    until `max_elements` distinct elements have been seen. The elements seen so far and
+    the remaining pairs are then hash-partitioned to disk, and each partition is
+    deduplicated in turn. Partitions that hold too many distinct elements themselves
+    are partitioned again with a different hash.
+
+    Args:
+        indexed: The (index, element) pairs. A negative index marks an element as seen
+            before, and is not produced. Elements must be hashable, and picklable if
+            there are more than `max_elements` distinct elements.
+        max_elements: Number of distinct elements to hold in memory before spilling.
+        ordered: Whether to produce the pairs in order of index. If so, the pairs
+            deduplicated from each partition are spilled again and merged by index.
+            Otherwise, they are produced partition by partition.
+        compress: Whether to compress the spilled pairs with zlib.
+        depth: The level of partitioning, salting the hash of the elements.
+    """
+    iterator = iter(indexed)
+    seen: set[T] = set()
+
+    for index, element in iterator:
+        if element in seen:
+            continue
+
+        if len(seen) >= max_elements and depth < MAX_PARTITION_DEPTH:
+            break
+
+        seen.add(element)
+        if index >= 0:
+            yield index, element
+    else:
+        return
+
+    partitions = _Partitions[tuple[int, T]](1, depth, compress)
+    outputs: list[SpillFile[tuple[int, T]]] = []
+
+    try:
+        # Marked as seen ahead of the remaining pairs, which all come later
+        partitions.write((-1, x) for x in seen)
+        seen.clear()
+        partitions.write([(index, element)])
+        partitions.write(iterator)
+        partitions.flush()
+
+        for partition in partitions.files:
+            deduplicated = hash_distinct(
+                iter(partition), max_elements, ordered, compress, depth + 1
+            )
+
+            if ordered:
+                outputs.append(_spilled(deduplicated, compress))
+            else:
+                yield from deduplicated
+
+            # Released as soon as it has been deduplicated
+            partition.close()
+
+        # The pairs of each partition are in order of index already
+        yield from heapq.merge(*outputs, key=operator.itemgetter(0))
+    finally:
+        partitions.close()
+
+        for output in outputs:
+            output.close()
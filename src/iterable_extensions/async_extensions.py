@@ -0,0 +1,382 @@
+import asyncio
+import inspect
+from collections import defaultdict, deque
+from collections.abc import (
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Coroutine,
+    Iterable,
+)
+from typing import Any, cast
+
+from extensionmethods import Extension
+
+from iterable_extensions.expressions import as_callable
+from iterable_extensions.types import Grouping
+
+type MaybeAwaitable[T] = T | Awaitable[T]
+
+type Source[T] = AsyncIterable[T] | Iterable[T]
+
+
+async def _resolve[T](value: MaybeAwaitable[T]) -> T:
+    if inspect.isawaitable(value):
+        return await value
+
+    return cast(T, value)
+
+
+async def _from_iterable[T](source: Iterable[T]) -> AsyncIterator[T]:
+    for element in source:
+        yield element
+
+
+def _aiter[T](source: Source[T]) -> AsyncIterator[T]:
+    if isinstance(source, AsyncIterable):
+        return aiter(source)
+
+    return _from_iterable(source)
+
+
+async def _map_concurrently[T, TOut](
+    source: AsyncIterable[T],
+    func: Callable[[T], MaybeAwaitable[TOut]],
+    max_concurrency: int,
+) -> AsyncIterator[tuple[T, TOut]]:
+    """Applies `func` to each element, awaiting at most `max_concurrency` results at
+    the same time. Yields (element, result) pairs in the order of the source."""
+    if max_concurrency <= 1:
+        async for element in source:
+            yield element, await _resolve(func(element))
+
+        return
+
+    async def _call(element: T) -> tuple[T, TOut]:
+        return element, await _resolve(func(element))
+
+    pending: deque[asyncio.Task[tuple[T, TOut]]] = deque()
+
+    try:
+        async for element in source:
+            if len(pending) >= max_concurrency:
+                yield await pending.popleft()
+
+            pending.append(asyncio.ensure_future(_call(element)))
+
+        while pending:
+            yield await pending.popleft()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+class AsyncReusableIterable[TIn, TOut](AsyncIterable[TOut]):
+    """An async iterable that applies `func` to `source` anew each time it is iterated.
+
+    Args:
+        source: The iterable to apply `func` to.
+        func: Function producing the resulting async iterator from the source.
+    """
+
+    def __init__(
+        self,
+        source: Source[TIn],
+        func: Callable[[Source[TIn]], AsyncIterator[TOut]],
+    ):
+        self._source = source
+        self._func = func
+
+    def __aiter__(self) -> AsyncIterator[TOut]:
+        return self._func(self._source)
+
+
+class count[T](Extension[Source[T], [], Coroutine[Any, Any, int]]):
+    def __init__(self):
+        """Count the number of elements in an async iterable.
+
+        Example:
+            ```
+            async def source():
+                for x in [1, 1, 1, 1, 1]:
+                    yield x
+
+            print(await (source() | count()))
+            # 5
+            ```
+        """
+
+        async def _count(source: Source[T]) -> int:
+            total = 0
+            async for _ in _aiter(source):
+                total += 1
+
+            return total
+
+        super().__init__(_count)
+
+
+class first[T](Extension[Source[T], [], Coroutine[Any, Any, T]]):
+    def __init__(self):
+        """Take the first element of an async iterable.
+
+        Raises:
+            ValueError: If the iterable contains no elements.
+
+        Example:
+            ```
+            async def source():
+                for x in [4, 7, 2]:
+                    yield x
+
+            print(await (source() | first()))
+            # 4
+            ```
+        """
+
+        async def _first(source: Source[T]) -> T:
+            try:
+                return await anext(_aiter(source))
+            except StopAsyncIteration:
+                raise ValueError("Iterable is empty.")
+
+        super().__init__(_first)
+
+
+class group_by[T, TKey](
+    Extension[
+        Source[T],
+        [Callable[[T], MaybeAwaitable[TKey]], int],
+        AsyncIterable[Grouping[T, TKey]],
+    ]
+):
+    def __init__(
+        self,
+        key_selector: Callable[[T], MaybeAwaitable[TKey]],
+        max_concurrency: int = 1,
+    ):
+        """Group the elements in an async iterable based on a key. Groups are returned in
+        order of first occurrence of their key.
+
+        Args:
+            key_selector (Callable[[T], MaybeAwaitable[TKey]]): Function to generate the key
+                for each element. May be a coroutine function.
+            max_concurrency (int, optional): Maximum number of keys being awaited at the
+                same time. Defaults to 1.
+
+        Note:
+            The entire input is consumed before the first group is produced.
+
+        Example:
+            ```
+            async def source():
+                for x in [1, 2, 3, 4, 5]:
+                    yield x
+
+            grouped = source() | group_by[int, bool](lambda x: x % 2 == 0)
+
+            print([g async for g in grouped])
+            # [False: [1, 3, 5], True: [2, 4]]
+            ```
+        """
+
+        def _group_by(
+            source: Source[T],
+            key_selector: Callable[[T], MaybeAwaitable[TKey]],
+            max_concurrency: int,
+        ) -> AsyncIterable[Grouping[T, TKey]]:
+            async def _func(source: Source[T]) -> AsyncIterator[Grouping[T, TKey]]:
+                groups: defaultdict[TKey, list[T]] = defaultdict(list)
+
+                async for element, key in _map_concurrently(
+                    _aiter(source), key_selector, max_concurrency
+                ):
+                    groups[key].append(element)
+
+                for key, elements in groups.items():
+                    yield Grouping(key, elements)
+
+            return AsyncReusableIterable(source, _func)
+
+        super().__init__(_group_by, as_callable(key_selector), max_concurrency)
+
+
+class select[TIn, TOut](
+    Extension[
+        Source[TIn],
+        [Callable[[TIn], MaybeAwaitable[TOut]], int],
+        AsyncIterable[TOut],
+    ]
+):
+    def __init__(
+        self,
+        selector: Callable[[TIn], MaybeAwaitable[TOut]],
+        max_concurrency: int = 1,
+    ):
+        """Transform each element in an async iterable according to a selector function.
+
+        Args:
+            selector (Callable[[TIn], MaybeAwaitable[TOut]]): Function to transform each
+                element. May be a coroutine function.
+            max_concurrency (int, optional): Maximum number of results being awaited at the
+                same time. Order is preserved regardless. Defaults to 1.
+
+        Example:
+            ```
+            async def lookup(x: int) -> str:
+                await asyncio.sleep(0.1)
+                return str(2 * x)
+
+            transformed = [1, 2, 3] | select[int, str](lookup, max_concurrency=10)
+
+            print([x async for x in transformed])
+            # ['2', '4', '6']
+            ```
+        """
+
+        def _select(
+            source: Source[TIn],
+            selector: Callable[[TIn], MaybeAwaitable[TOut]],
+            max_concurrency: int,
+        ) -> AsyncIterable[TOut]:
+            async def _func(source: Source[TIn]) -> AsyncIterator[TOut]:
+                async for _, result in _map_concurrently(
+                    _aiter(source), selector, max_concurrency
+                ):
+                    yield result
+
+            return AsyncReusableIterable(source, _func)
+
+        super().__init__(_select, as_callable(selector), max_concurrency)
+
+
+class to_dictionary[T, TKey, TValue](
+    Extension[
+        Source[T],
+        [
+            Callable[[T], MaybeAwaitable[TKey]],
+            Callable[[T], MaybeAwaitable[TValue]] | None,
+        ],
+        Coroutine[Any, Any, dict[TKey, TValue]],
+    ]
+):
+    def __init__(
+        self,
+        key_selector: Callable[[T], MaybeAwaitable[TKey]],
+        value_selector: Callable[[T], MaybeAwaitable[TValue]] | None = None,
+    ):
+        """Transform an async iterable into a dictionary based on a key. Optionally
+        transform each element.
+
+        Args:
+            key_selector (Callable[[T], MaybeAwaitable[TKey]]): Function to generate key for
+                each element. May be a coroutine function.
+            value_selector (Callable[[T], MaybeAwaitable[TValue]] | None, optional): Function
+                to transform each element. May be a coroutine function. Defaults to None.
+
+        Example:
+            ```
+            async def source():
+                for x in [1, 2, 3]:
+                    yield x
+
+            print(await (source() | to_dictionary[int, int, str](lambda x: x, str)))
+            # {1: '1', 2: '2', 3: '3'}
+            ```
+        """
+
+        async def _to_dictionary(
+            source: Source[T],
+            key_selector: Callable[[T], MaybeAwaitable[TKey]],
+            value_selector: Callable[[T], MaybeAwaitable[TValue]] | None,
+        ) -> dict[TKey, TValue]:
+            result: dict[TKey, TValue] = {}
+
+            async for element in _aiter(source):
+                key = await _resolve(key_selector(element))
+
+                if value_selector:
+                    result[key] = await _resolve(value_selector(element))
+                else:
+                    result[key] = cast(TValue, element)
+
+            return result
+
+        super().__init__(
+            _to_dictionary,
+            as_callable(key_selector),
+            None if value_selector is None else as_callable(value_selector),
+        )
+
+
+class to_list[T](Extension[Source[T], [], Coroutine[Any, Any, list[T]]]):
+    def __init__(self):
+        """Materialize an async iterable into a list.
+
+        Example:
+            ```
+            async def source():
+                for x in range(5):
+                    yield x
+
+            print(await (source() | to_list()))
+            # [0, 1, 2, 3, 4]
+            ```
+        """
+
+        async def _to_list(source: Source[T]) -> list[T]:
+            return [element async for element in _aiter(source)]
+
+        super().__init__(_to_list)
+
+
+class where[T](
+    Extension[
+        Source[T],
+        [Callable[[T], MaybeAwaitable[bool]], int],
+        AsyncIterable[T],
+    ]
+):
+    def __init__(
+        self,
+        predicate: Callable[[T], MaybeAwaitable[bool]],
+        max_concurrency: int = 1,
+    ):
+        """Filter an async iterable based on a predicate. Only elements for which the
+        predicate evaluates to true are included in the resulting iterable.
+
+        Args:
+            predicate (Callable[[T], MaybeAwaitable[bool]]): Function to include an element.
+                May be a coroutine function.
+            max_concurrency (int, optional): Maximum number of predicate results being
+                awaited at the same time. Order is preserved regardless. Defaults to 1.
+
+        Example:
+            ```
+            async def source():
+                for x in [1, 2, 3, 4, 5]:
+                    yield x
+
+            filtered = source() | where[int](lambda x: x > 3)
+
+            print([x async for x in filtered])
+            # [4, 5]
+            ```
+        """
+
+        def _where(
+            source: Source[T],
+            predicate: Callable[[T], MaybeAwaitable[bool]],
+            max_concurrency: int,
+        ) -> AsyncIterable[T]:
+            async def _func(source: Source[T]) -> AsyncIterator[T]:
+                async for element, keep in _map_concurrently(
+                    _aiter(source), predicate, max_concurrency
+                ):
+                    if keep:
+                        yield element
+
+            return AsyncReusableIterable(source, _func)
+
+        super().__init__(_where, as_callable(predicate), max_concurrency)
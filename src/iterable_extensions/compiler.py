@@ -0,0 +1,321 @@
+from collections.abc import Callable, Iterable, Sequence
+from typing import Any, Literal
+
+from extensionmethods import Extension
+
+from iterable_extensions.expressions import Expression, inline
+from iterable_extensions.iterable_extensions import (
+    ReusableIterable,
+    _ndarray,
+    any,
+    count,
+    first,
+    first_or_none,
+    last,
+    last_or_none,
+    max,
+    min,
+    select,
+    to_dictionary,
+    to_list,
+    where,
+)
+
+_MISSING: Any = object()
+
+# Per terminal: the lines before the loop, per element, and after the loop
+_TERMINALS: dict[type, tuple[list[str], list[str], list[str]]] = {
+    to_list: (
+        ["result = []", "append = result.append"],
+        ["append(x)"],
+        ["return result"],
+    ),
+    count: (
+        ["result = 0"],
+        ["result += 1"],
+        ["return result"],
+    ),
+    first: (
+        [],
+        ["return x"],
+        ["raise ValueError('Iterable is empty.')"],
+    ),
+    first_or_none: (
+        [],
+        ["return x"],
+        ["return None"],
+    ),
+    last: (
+        ["result = _MISSING"],
+        ["result = x"],
+        [
+            "if result is _MISSING:",
+            "    raise ValueError('Iterable contains no elements.')",
+            "return result",
+        ],
+    ),
+    last_or_none: (
+        ["result = None"],
+        ["result = x"],
+        ["return result"],
+    ),
+    min: (
+        ["result = _MISSING"],
+        ["if result is _MISSING or x < result:", "    result = x"],
+        [
+            "if result is _MISSING:",
+            "    raise ValueError('Iterable is empty.')",
+            "return result",
+        ],
+    ),
+    max: (
+        ["result = _MISSING"],
+        ["if result is _MISSING or x > result:", "    result = x"],
+        [
+            "if result is _MISSING:",
+            "    raise ValueError('Iterable is empty.')",
+            "return result",
+        ],
+    ),
+}
+
+
+class _Generator:
+    """Generates the source code of a single function executing a plan, binding the
+    callables and constants it uses as default arguments, i.e. as fast local lookups."""
+
+    def __init__(self):
+        self.bound: dict[str, Any] = {"_MISSING": _MISSING}
+
+    def call(self, func: Callable[[Any], Any]) -> str:
+        """Source code applying `func` to the element `x`. Expressions are inlined."""
+        if isinstance(func, Expression):
+            return f"({inline(func, 'x', self.bound)})"
+
+        name = f"_f{len(self.bound)}"
+        self.bound[name] = func
+
+        return f"{name}(x)"
+
+    def terminal(self, extension: Extension | None) -> tuple[list[str], ...]:
+        if extension is None:
+            return [], ["yield x"], []
+
+        if isinstance(extension, any):
+            (predicate,) = extension._args
+            if predicate is None:
+                return [], ["return True"], ["return False"]
+
+            return (
+                [],
+                [f"if {self.call(predicate)} is True:", "    return True"],
+                ["return False"],
+            )
+
+        if isinstance(extension, to_dictionary):
+            key_selector, value_selector = extension._args
+            value = "x" if value_selector is None else self.call(value_selector)
+
+            return (
+                ["result = {}"],
+                [f"result[{self.call(key_selector)}] = {value}"],
+                ["return result"],
+            )
+
+        return _TERMINALS[type(extension)]
+
+    def generate(
+        self,
+        stages: Sequence[tuple[Literal["where", "select"], Callable[[Any], Any]]],
+        terminal: Extension | None,
+    ) -> Callable[[Iterable[Any]], Any]:
+        # Generates e.g. for where(F > 3), select(f) and to_list():
+        #
+        # def _plan(source, _MISSING=_MISSING, _c1=_c1, _f2=_f2):
+        #     result = []
+        #     append = result.append
+        #     for x in source:
+        #         if not ((x > _c1)):
+        #             continue
+        #         x = _f2(x)
+        #         append(x)
+        #     return result
+        loop = []
+        for kind, func in stages:
+            if kind == "where":
+                loop += [f"if not ({self.call(func)}):", "    continue"]
+            else:
+                loop += [f"x = {self.call(func)}"]
+
+        before, per_element, after = self.terminal(terminal)
+        loop += per_element
+
+        parameters = "".join(f", {name}={name}" for name in self.bound)
+
+        lines = [f"def _plan(source{parameters}):"]
+        lines += [f"    {line}" for line in before]
+        lines += ["    for x in source:"]
+        lines += [f"        {line}" for line in loop]
+        lines += [f"    {line}" for line in after]
+
+        namespace = dict(self.bound)
+        exec("\n".join(lines), namespace)
+
+        return namespace["_plan"]
+
+
+class _CompiledSegment(Extension[Iterable[Any], [], Any]):
+    """Consecutive `where` and `select` stages, optionally followed by a terminal
+    method, executed as a single generated function."""
+
+    # See the end of `iterable_extensions.py`
+    __array_ufunc__ = None
+
+    def __init__(self, extensions: Sequence[Extension], has_terminal: bool):
+        stages: list[tuple[Literal["where", "select"], Callable[[Any], Any]]] = [
+            ("where" if isinstance(extension, where) else "select", extension._args[0])
+            for extension in extensions[: len(extensions) - has_terminal]
+        ]
+        terminal = extensions[-1] if has_terminal else None
+
+        plan = _Generator().generate(stages, terminal)
+        length = "exact" if all(kind == "select" for kind, _ in stages) else "bounded"
+
+        def _segment(source: Iterable[Any]) -> Any:
+            if _ndarray(source) is not None:
+                # Keep the stages separate, such that they can be vectorized
+                result = source
+                for extension in extensions:
+                    result = result | extension
+
+                return result
+
+            if has_terminal:
+                return plan(source)
+
+            return ReusableIterable(
+                source,
+                plan,
+                length=length,
+                name="compile",
+                optimization="compiled into a single function",
+            )
+
+        super().__init__(_segment)
+
+
+def _segments(extensions: Sequence[Extension]) -> list[Extension]:
+    """Replaces each run of `where` and `select` stages in `extensions`, including a
+    supported terminal method directly following it, by a single compiled segment."""
+    result: list[Extension] = []
+    run: list[Extension] = []
+
+    for extension in extensions:
+        if isinstance(extension, (where, select)):
+            run.append(extension)
+            continue
+
+        if run and isinstance(extension, (any, to_dictionary, *_TERMINALS)):
+            result.append(_CompiledSegment([*run, extension], has_terminal=True))
+        else:
+            if run:
+                result.append(_CompiledSegment(run, has_terminal=False))
+            result.append(extension)
+
+        run = []
+
+    if run:
+        result.append(_CompiledSegment(run, has_terminal=False))
+
+    return result
+
+
+def _apply(source: Iterable[Any], segments: list[Extension]) -> Any:
+    result = source
+    for segment in segments:
+        result = result | segment
+
+    return result
+
+
+class compile(Extension[Iterable[Any], [list[Extension]], Any]):
+    # NumPy arrays implement `|` themselves, see the end of `iterable_extensions.py`
+    __array_ufunc__ = None
+
+    def __init__(self, *extensions: Extension):
+        """Compile a chain of extension methods into a plan that can be applied to any
+        number of sources.
+
+        Each run of consecutive `where` and `select` stages, together with a terminal
+        method directly following it (`any`, `count`, `first`, `first_or_none`, `last`,
+        `last_or_none`, `max`, `min`, `to_dictionary` or `to_list`), is generated as a
+        single flat loop. Expressions (see `Expression`) are inlined into that loop, and
+        other functions are bound as local variables. Other extension methods are applied
+        as usual.
+
+        Code is generated once, when compiling. Applying the plan creates no
+        intermediate iterables or generators, which pays off for simple predicates and
+        selectors, where the overhead of the pipeline itself would dominate.
+
+        Args:
+            *extensions (Extension): The extension methods, in the order they are applied.
+
+        Note:
+            One-dimensional NumPy arrays are not processed by the generated loops, but
+            by the extension methods themselves, such that they can be vectorized.
+
+        Example:
+            ```
+            plan = compile(where(F.age > 30), select(F.name), to_list())
+
+            print(people | plan)
+            # ['Arthur', 'Chris']
+
+            print(other_people | plan)
+            # ['Dave']
+            ```
+        """
+        super().__init__(_apply, _segments(extensions))
+
+
+class Pipeline(Extension[Iterable[Any], [list[Extension]], Any]):
+    # NumPy arrays implement `|` themselves, see the end of `iterable_extensions.py`
+    __array_ufunc__ = None
+
+    def __init__(self, *extensions: Extension):
+        """A reusable chain of extension methods, built once and applied to any number of
+        sources.
+
+        Chaining extension methods onto a source creates new extension objects, closures
+        and intermediate iterables each time. For small inputs, e.g. in a request
+        handler, that construction may cost more than processing the elements. A
+        pipeline pays those costs once: it is compiled as with `compile` when it is
+        built, so applying it only runs the generated code.
+
+        Extension methods are added with `|`, as when chaining them onto a source, which
+        returns a new pipeline.
+
+        Args:
+            *extensions (Extension): The initial extension methods, in the order they
+                are applied.
+
+        Example:
+            ```
+            names_over_30 = Pipeline() | where(F.age > 30) | select(F.name) | to_list()
+
+            print(people | names_over_30)
+            # ['Arthur', 'Chris']
+
+            print(other_people | names_over_30)
+            # ['Dave']
+            ```
+        """
+        self._extensions = extensions
+
+        super().__init__(_apply, _segments(extensions))
+
+    def __or__(self, extension: Extension) -> "Pipeline":
+        if isinstance(extension, Pipeline):
+            return Pipeline(*self._extensions, *extension._extensions)
+
+        return Pipeline(*self._extensions, extension)
@@ -0,0 +1,421 @@
+import operator
+from collections.abc import Callable
+from typing import Any, Literal
+
+type Operation = Literal[
+    "element",
+    "constant",
+    "attribute",
+    "item",
+    "call",
+    "unary",
+    "binary",
+]
+
+_BINARY_OPERATORS = {
+    "eq": "==",
+    "ne": "!=",
+    "lt": "<",
+    "le": "<=",
+    "gt": ">",
+    "ge": ">=",
+    "add": "+",
+    "sub": "-",
+    "mul": "*",
+    "truediv": "/",
+    "floordiv": "//",
+    "mod": "%",
+    "pow": "**",
+    "and": "and",
+    "or": "or",
+}
+
+_UNARY_OPERATORS = {
+    "neg": "-",
+    "pos": "+",
+    "not": "not ",
+}
+
+# Operators that have a different spelling when applied to entire NumPy arrays. These
+# only coincide with the logical operators for boolean operands.
+_ARRAY_OPERATORS = {
+    "and": "&",
+    "or": "|",
+    "not": "~",
+}
+
+_COMPARISONS = ("eq", "ne", "lt", "le", "gt", "ge")
+
+
+class Expression:
+    """A declarative description of a function of a single element, such as
+    `F.age > 30`, `F.name.upper.call()` or `F["key"]`.
+
+    Expressions are callable, so they can be passed anywhere a selector, predicate or
+    key selector is expected. Unlike a lambda, their structure can be inspected (see
+    `structure`), which allows them to be compiled to efficient code, and to be applied
+    to entire NumPy arrays at once.
+
+    Expressions are built from `F`, which represents the element itself. Use `&`, `|` and
+    `~` for logical and, or and not, as Python's `and`, `or` and `not` cannot be
+    overloaded. They are evaluated as the logical operators, also on NumPy arrays: an
+    expression is only applied to an entire array at once if their operands are
+    comparisons, or combinations thereof.
+
+    Calling an expression always evaluates it for the given element, so expressions can
+    also be passed to other functions, e.g. as the key for `sorted`. Method calls are
+    described with `call`, as in `F.name.upper.call()`.
+
+    Note:
+        As `call` describes a method call, an attribute named `call` cannot be accessed
+        in an expression. Use a lambda for such elements instead.
+
+    Example:
+        ```
+        source = [
+            Person(31, "Arthur"),
+            Person(12, "Becky"),
+            Person(45, "Chris"),
+        ]
+
+        result = source | where(F.age > 30) | select(F.name.upper.call())
+
+        print(list(result))
+        # ['ARTHUR', 'CHRIS']
+        ```
+    """
+
+    __slots__ = ("_operation", "_operands", "_compiled")
+
+    def __init__(self, operation: Operation, *operands: Any):
+        self._operation: Operation = operation
+        self._operands = operands
+        self._compiled: Callable[[Any], Any] | None = None
+
+    def __call__(self, element: Any) -> Any:
+        return _compile(self)(element)
+
+    def call(self, *args: Any, **kwargs: Any) -> "Expression":
+        """Describes calling the result of this expression with the given arguments,
+        which may be expressions themselves.
+
+        Example:
+            ```
+            print(list(["a-b", "c-d-e"] | select(F.split.call("-", maxsplit=1))))
+            # [['a', 'b'], ['c', 'd-e']]
+            ```
+        """
+        return Expression(
+            "call",
+            self,
+            tuple(_wrap(arg) for arg in args),
+            tuple((name, _wrap(value)) for name, value in kwargs.items()),
+        )
+
+    def __repr__(self) -> str:
+        # Spelled with &, | and ~, as the expression is written
+        return _source(self, "F", None, array=True)
+
+    def __getattr__(self, name: str) -> "Expression":
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        return Expression("attribute", self, name)
+
+    def __getitem__(self, key: Any) -> "Expression":
+        return Expression("item", self, _wrap(key))
+
+    def __iter__(self):
+        raise TypeError("Expression is not iterable.")
+
+    def __bool__(self):
+        raise TypeError(
+            "Expression has no truth value. Use &, | and ~ instead of and, or and not."
+        )
+
+    def _binary(
+        self, operation: str, other: Any, reflected: bool = False
+    ) -> "Expression":
+        if reflected:
+            return Expression("binary", operation, _wrap(other), self)
+
+        return Expression("binary", operation, self, _wrap(other))
+
+    def __eq__(self, other: Any) -> "Expression":  # type: ignore[override]
+        return self._binary("eq", other)
+
+    def __ne__(self, other: Any) -> "Expression":  # type: ignore[override]
+        return self._binary("ne", other)
+
+    def __lt__(self, other: Any) -> "Expression":
+        return self._binary("lt", other)
+
+    def __le__(self, other: Any) -> "Expression":
+        return self._binary("le", other)
+
+    def __gt__(self, other: Any) -> "Expression":
+        return self._binary("gt", other)
+
+    def __ge__(self, other: Any) -> "Expression":
+        return self._binary("ge", other)
+
+    def __add__(self, other: Any) -> "Expression":
+        return self._binary("add", other)
+
+    def __radd__(self, other: Any) -> "Expression":
+        return self._binary("add", other, reflected=True)
+
+    def __sub__(self, other: Any) -> "Expression":
+        return self._binary("sub", other)
+
+    def __rsub__(self, other: Any) -> "Expression":
+        return self._binary("sub", other, reflected=True)
+
+    def __mul__(self, other: Any) -> "Expression":
+        return self._binary("mul", other)
+
+    def __rmul__(self, other: Any) -> "Expression":
+        return self._binary("mul", other, reflected=True)
+
+    def __truediv__(self, other: Any) -> "Expression":
+        return self._binary("truediv", other)
+
+    def __rtruediv__(self, other: Any) -> "Expression":
+        return self._binary("truediv", other, reflected=True)
+
+    def __floordiv__(self, other: Any) -> "Expression":
+        return self._binary("floordiv", other)
+
+    def __rfloordiv__(self, other: Any) -> "Expression":
+        return self._binary("floordiv", other, reflected=True)
+
+    def __mod__(self, other: Any) -> "Expression":
+        return self._binary("mod", other)
+
+    def __rmod__(self, other: Any) -> "Expression":
+        return self._binary("mod", other, reflected=True)
+
+    def __pow__(self, other: Any) -> "Expression":
+        return self._binary("pow", other)
+
+    def __rpow__(self, other: Any) -> "Expression":
+        return self._binary("pow", other, reflected=True)
+
+    def __and__(self, other: Any) -> "Expression":
+        return self._binary("and", other)
+
+    def __rand__(self, other: Any) -> "Expression":
+        return self._binary("and", other, reflected=True)
+
+    def __or__(self, other: Any) -> "Expression":
+        return self._binary("or", other)
+
+    def __ror__(self, other: Any) -> "Expression":
+        return self._binary("or", other, reflected=True)
+
+    def __neg__(self) -> "Expression":
+        return Expression("unary", "neg", self)
+
+    def __pos__(self) -> "Expression":
+        return Expression("unary", "pos", self)
+
+    def __invert__(self) -> "Expression":
+        return Expression("unary", "not", self)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    # The compiled form cannot be pickled, e.g. to be sent to another process
+    def __getstate__(self) -> tuple[Operation, tuple[Any, ...]]:
+        return self._operation, self._operands
+
+    def __setstate__(self, state: tuple[Operation, tuple[Any, ...]]) -> None:
+        self._operation, self._operands = state
+        self._compiled = None
+
+
+F = Expression("element")
+"""The element itself, from which expressions are built. See `Expression`."""
+
+
+def _wrap(value: Any) -> Expression:
+    return value if isinstance(value, Expression) else Expression("constant", value)
+
+
+def structure(expression: Expression) -> tuple[Any, ...]:
+    """The structure of an expression, as nested tuples of an operation followed by its
+    operands, for analysis.
+
+    Example:
+        ```
+        print(structure(F.age > 30))
+        # ('binary', 'gt', ('attribute', ('element',), 'age'), ('constant', 30))
+        ```
+    """
+
+    def _structure(operand: Any) -> Any:
+        if isinstance(operand, Expression):
+            return structure(operand)
+        if isinstance(operand, tuple):
+            return tuple(_structure(x) for x in operand)
+
+        return operand
+
+    return (expression._operation, *map(_structure, expression._operands))
+
+
+def is_vectorizable(expression: Expression) -> bool:
+    """Whether an expression consists only of operators applied to the element and to
+    constants, such that it can be applied to an entire NumPy array at once."""
+    if expression._operation in ("element", "constant"):
+        return True
+
+    if expression._operation in ("unary", "binary"):
+        operands = [x for x in expression._operands if isinstance(x, Expression)]
+
+        # NumPy's &, | and ~ are bitwise, which only matches the logical operators for
+        # booleans
+        if expression._operands[0] in _ARRAY_OPERATORS and not all(
+            _is_boolean(operand) for operand in operands
+        ):
+            return False
+
+        return all(is_vectorizable(operand) for operand in operands)
+
+    return False
+
+
+def _is_boolean(expression: Expression) -> bool:
+    """Whether an expression evaluates to a boolean: a comparison, a logical combination
+    of booleans, or a boolean constant."""
+    operation, operands = expression._operation, expression._operands
+
+    if operation == "constant":
+        return isinstance(operands[0], bool)
+
+    if operation in ("unary", "binary"):
+        name, *arguments = operands
+
+        if name in _COMPARISONS:
+            return True
+
+        if name in _ARRAY_OPERATORS:
+            return all(_is_boolean(argument) for argument in arguments)
+
+    return False
+
+
+def _source(
+    expression: Expression,
+    variable: str,
+    constants: dict[str, Any] | None,
+    array: bool,
+) -> str:
+    """Python source code evaluating the expression for the element named `variable`.
+    Constants are added to `constants` and referred to by name, or written out if
+    `constants` is None."""
+    operation, operands = expression._operation, expression._operands
+
+    def _operand(operand: Expression) -> str:
+        return _source(operand, variable, constants, array)
+
+    match operation:
+        case "element":
+            return variable
+        case "constant":
+            if constants is None:
+                return repr(operands[0])
+            name = f"_c{len(constants)}"
+            constants[name] = operands[0]
+            return name
+        case "attribute":
+            base, name = operands
+            if name.isidentifier():
+                return f"{_operand(base)}.{name}"
+            return f"getattr({_operand(base)}, {name!r})"
+        case "item":
+            base, key = operands
+            return f"{_operand(base)}[{_operand(key)}]"
+        case "call":
+            function, args, kwargs = operands
+            arguments = [_operand(arg) for arg in args]
+            arguments += [f"{name}={_operand(value)}" for name, value in kwargs]
+            return f"{_operand(function)}({', '.join(arguments)})"
+        case "unary":
+            name, operand = operands
+            symbol = (array and _ARRAY_OPERATORS.get(name)) or _UNARY_OPERATORS[name]
+            return f"({symbol}{_operand(operand)})"
+        case "binary":
+            name, left, right = operands
+            symbol = (array and _ARRAY_OPERATORS.get(name)) or _BINARY_OPERATORS[name]
+            return f"({_operand(left)} {symbol} {_operand(right)})"
+
+    raise ValueError(f"Unknown operation: {operation!r}.")
+
+
+def inline(expression: Expression, variable: str, constants: dict[str, Any]) -> str:
+    """Python source code evaluating the expression for the element named `variable`, to
+    be inlined in generated code. Constants are added to `constants`, and must be bound
+    by those names."""
+    return _source(expression, variable, constants, array=False)
+
+
+def _accessor(expression: Expression) -> Callable[[Any], Any] | None:
+    """An `operator` callable, implemented in C, that evaluates the expression, if it
+    consists of a single item access or a chain of attribute accesses on the element."""
+    operation, operands = expression._operation, expression._operands
+
+    if operation == "item" and operands[0]._operation == "element":
+        key = operands[1]
+        if key._operation == "constant":
+            return operator.itemgetter(key._operands[0])
+
+    path = []
+    while operation == "attribute":
+        expression, name = operands
+        path.append(name)
+        operation, operands = expression._operation, expression._operands
+
+    if path and operation == "element":
+        return operator.attrgetter(".".join(reversed(path)))
+
+    return None
+
+
+def _generate(expression: Expression, array: bool) -> Callable[[Any], Any]:
+    constants: dict[str, Any] = {}
+    body = _source(expression, "x", constants, array)
+
+    # Constants are bound as default arguments, which makes them fast local lookups
+    parameters = "".join(f", {name}={name}" for name in constants)
+
+    namespace = dict(constants)
+    exec(f"def _expression(x{parameters}):\n    return {body}", namespace)
+
+    return namespace["_expression"]
+
+
+def as_callable[T, TOut](func: Callable[[T], TOut]) -> Callable[[T], TOut]:
+    """The most efficient plain callable for `func`: the compiled form of an expression,
+    or `func` itself otherwise."""
+    if isinstance(func, Expression):
+        return _compile(func)
+
+    return func
+
+
+def evaluate(expression: Expression, element: Any) -> Any:
+    """Evaluates the expression for one element."""
+    return _compile(expression)(element)
+
+
+def _compile(expression: Expression) -> Callable[[Any], Any]:
+    """The most efficient plain callable evaluating the expression for one element."""
+    if expression._compiled is None:
+        expression._compiled = _accessor(expression) or _generate(expression, False)
+
+    return expression._compiled
+
+
+def as_array_callable(expression: Expression) -> Callable[[Any], Any]:
+    """A callable evaluating a vectorizable expression for an entire NumPy array."""
+    return _generate(expression, array=True)
@@ -1,26 +1,666 @@
+import array
 import builtins
+import functools
+import heapq
 import itertools
-from collections.abc import Callable, Iterable, Iterator
-from typing import cast, overload
+import multiprocessing
+import operator
+import os
+import sys
+import threading
+from collections import defaultdict, deque
+from collections.abc import (
+    Callable,
+    Iterable,
+    Iterator,
+    Reversible,
+    Sequence,
+    Sized,
+)
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
+from multiprocessing.context import BaseContext
+from typing import Any, Literal, NamedTuple, cast, overload
 
 from extensionmethods import Extension
 
-from iterable_extensions.types import Grouping, SupportsComparison
+from iterable_extensions._spill import (
+    ReplayBuffer,
+    external_sorted,
+    hash_distinct,
+    hash_grouped,
+)
+from iterable_extensions.expressions import (
+    Expression,
+    as_array_callable,
+    as_callable,
+    evaluate,
+    is_vectorizable,
+)
+from iterable_extensions.profiling import (
+    StageProfile,
+    instrument,
+    instrument_stage,
+    iterate,
+    recording,
+    register,
+)
+from iterable_extensions.types import (
+    Grouping,
+    GroupingStrategy,
+    Plan,
+    PlanStage,
+    SupportsComparison,
+)
 
 
 class ReusableIterable[TIn, TOut](Iterable[TOut]):
+    """An iterable that applies `func` to `source` anew each time it is iterated.
+
+    One-shot sources, i.e. iterators such as generators and file objects, are not
+    buffered: iterating again continues where the previous iteration left off, and
+    raises a `RuntimeError` once the source is exhausted, instead of silently producing
+    no elements. See `replay` to make them reusable.
+
+    Args:
+        source: The iterable to apply `func` to.
+        func: Function producing the resulting iterator from the source.
+        length: How the number of resulting elements relates to the number of elements
+            in the source. "exact" if equal, "bounded" if at most equal, None if unknown.
+        name: The name of the stage, as reported by `profile` and `explain`. Defaults to
+            the name of the class.
+        memory: What the stage holds in memory, as reported by `explain`. None if it
+            holds no more than a few elements at a time.
+        materializes: Whether the stage reads its entire source before producing the
+            first element.
+        optimization: An optimization that applies to the stage, as reported by
+            `explain`.
+    """
+
     def __init__(
         self,
         source: Iterable[TIn],
         func: Callable[[Iterable[TIn]], Iterator[TOut]],
+        length: Literal["exact", "bounded"] | None = None,
+        name: str | None = None,
+        memory: str | None = None,
+        materializes: bool = False,
+        optimization: str | None = None,
     ):
+        if isinstance(source, Iterator):
+            source = _OneShot(source)
 
         self._source = source
         self._func = func
+        self._length = length
+        self._stage_name = name
+        self._memory = memory
+        self._materializes = materializes
+        self._optimization = optimization
+        self._profile = (
+            register(
+                self._name,
+                source._profile if isinstance(source, ReusableIterable) else None,
+            )
+            if recording()
+            else None
+        )
+
+    @property
+    def _name(self) -> str:
+        """The name of the stage, as reported by `profile` and `explain`."""
+        return self._stage_name or type(self).__name__
 
     def __iter__(self) -> Iterator[TOut]:
+        if self._profile is not None:
+            return iterate(self._profile, self._func, self._source)
+
         return self._func(self._source)
 
+    def _apply[TResult](
+        self, func: Callable[[Iterable[TIn]], Iterator[TResult]]
+    ) -> Iterator[TResult]:
+        """Applies `func` to the source as an iteration of this stage, such that
+        consumers reading the source through a shortcut are profiled as reading from
+        this stage."""
+        if self._profile is not None:
+            return iterate(self._profile, func, self._source)
+
+        return func(self._source)
+
+    def __length_hint__(self) -> int:
+        # Only exact lengths are reported: an upper bound from a selective filter
+        # could make e.g. list() overallocate by orders of magnitude
+        length = self._exact_length()
+
+        return NotImplemented if length is None else length
+
+    def _exact_length(self) -> int | None:
+        """The number of elements, if it is known without iterating."""
+        if self._length == "exact":
+            return _exact_length(self._source)
+
+        return None
+
+    def _max_length(self) -> int | None:
+        """An upper bound on the number of elements, if it is known without iterating."""
+        if self._length is not None:
+            return _max_length(self._source)
+
+        return None
+
+
+class _OneShot[T](Iterable[T]):
+    """A one-shot iterator. Iterating it again continues where the previous iteration
+    left off, but raises if nothing is left, rather than silently producing no
+    elements."""
+
+    def __init__(self, source: Iterator[T]):
+        self._source = source
+        self._iterated = False
+
+    def __iter__(self) -> Iterator[T]:
+        if self._iterated:
+            return self._resume()
+
+        self._iterated = True
+
+        return self._source
+
+    def _resume(self) -> Iterator[T]:
+        try:
+            first = next(self._source)
+        except StopIteration:
+            raise RuntimeError(
+                "The source is a one-shot iterator, such as a generator, and has been "
+                "exhausted already. Apply replay() to it, or to a pipeline over it, to "
+                "make it reusable."
+            ) from None
+
+        yield first
+        yield from self._source
+
+
+class _Stage(NamedTuple):
+    kind: Literal["where", "select"]
+    func: Callable[[Any], Any]
+    profile: StageProfile | None = None
+
+
+class _FusedIterable[TIn, TOut](ReusableIterable[TIn, TOut]):
+    """A chain of consecutive `where` and `select` stages over a single source.
+
+    Instead of nesting one `ReusableIterable` (and thus one generator) per stage,
+    consecutive stages are collected here and executed in a single flat loop.
+    """
+
+    def __init__(
+        self,
+        source: Iterable[TIn],
+        stages: tuple[_Stage, ...],
+        length: Literal["exact", "bounded"],
+    ):
+        # Set first, as the name is derived from the stages when profiling
+        self._stages = stages
+
+        super().__init__(source, functools.partial(_run_stages, stages), length=length)
+
+        if self._profile is not None:
+            self._profile.stages = [
+                stage.profile for stage in stages if stage.profile is not None
+            ]
+
+    @property
+    def _name(self) -> str:
+        return " | ".join(stage.kind for stage in self._stages)
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_stages(
+    kinds: tuple[Literal["where", "select"], ...],
+) -> Callable[..., Iterator[Any]]:
+    # Generates e.g. for ("where", "select"):
+    #
+    # def _fused(source, f0, f1):
+    #     for x in source:
+    #         if not f0(x):
+    #             continue
+    #         x = f1(x)
+    #         yield x
+    names = [f"f{i}" for i in range(len(kinds))]
+
+    lines = [f"def _fused(source, {', '.join(names)}):", "    for x in source:"]
+    for kind, name in zip(kinds, names):
+        if kind == "where":
+            lines.append(f"        if not {name}(x):")
+            lines.append("            continue")
+        else:
+            lines.append(f"        x = {name}(x)")
+    lines.append("        yield x")
+
+    namespace: dict[str, Any] = {}
+    exec("\n".join(lines), namespace)
+
+    return namespace["_fused"]
+
+
+class vectorized[TOut]:
+    """Marks a function as elementwise, such that it may be applied to an entire
+    one-dimensional NumPy array at once, instead of to each element separately.
+
+    `where` and `select` stages over a NumPy array are vectorized when their function
+    is a unary NumPy ufunc, is marked with `vectorized`, or is an expression consisting
+    only of operators (see `Expression`). For `where`, the function must then return a
+    boolean mask when applied to an array.
+
+    Args:
+        func: The elementwise function.
+
+    Example:
+        ```
+        source = np.arange(10)
+
+        result = source | where(vectorized(lambda x: x % 2 == 0)) | select(np.sqrt)
+
+        print(result | max())
+        # 2.8284271247461903
+        ```
+    """
+
+    # The element type is Any, as it differs between elements and arrays, and so that a
+    # lambda's parameter need not be annotated
+    def __init__(self, func: Callable[[Any], TOut]):
+        self._func = func
+
+    def __call__(self, value: Any) -> TOut:
+        return self._func(value)
+
+
+def _ndarray(source: Iterable[Any]) -> Any | None:
+    """`source` if it is a one-dimensional NumPy array, otherwise None."""
+    # If numpy has not been imported, the source cannot be an array
+    numpy = sys.modules.get("numpy")
+
+    if numpy is not None and isinstance(source, numpy.ndarray):
+        array = cast(Any, source)
+
+        if array.ndim == 1:
+            return array
+
+    return None
+
+
+def _is_vectorizable(func: Callable[[Any], Any]) -> bool:
+    if isinstance(func, vectorized):
+        return True
+
+    if isinstance(func, Expression):
+        return is_vectorizable(func)
+
+    numpy = sys.modules["numpy"]
+
+    if not isinstance(func, numpy.ufunc):
+        return False
+
+    ufunc = cast(Any, func)
+
+    return ufunc.nin == 1 and ufunc.nout == 1
+
+
+def _vectorize_stages(
+    array: Any,
+    stages: tuple[_Stage, ...],
+) -> tuple[Any, tuple[_Stage, ...]]:
+    """Applies the leading vectorizable stages to a NumPy array at once. Returns the
+    resulting array and the stages that remain to be applied per element."""
+    numpy = sys.modules["numpy"]
+
+    for index, (kind, func, _) in enumerate(stages):
+        if not _is_vectorizable(func):
+            return array, stages[index:]
+
+        if isinstance(func, Expression):
+            func = as_array_callable(func)
+
+        try:
+            result = func(array)
+        except Exception:
+            return array, stages[index:]
+
+        if not isinstance(result, numpy.ndarray) or result.shape != array.shape:
+            return array, stages[index:]
+
+        if kind == "where":
+            if result.dtype != numpy.bool_:
+                return array, stages[index:]
+
+            array = array[result]
+        else:
+            array = result
+
+    return array, ()
+
+
+def _as_ndarray(source: Iterable[Any]) -> Any | None:
+    """`source` as a one-dimensional NumPy array, if it is one, or if it is computed from
+    one by vectorizable stages only. Otherwise None."""
+    if _ndarray(source) is not None:
+        return source
+
+    if isinstance(source, _FusedIterable):
+        array = _as_ndarray(source._source)
+
+        if array is not None and builtins.all(
+            _is_vectorizable(stage.func) for stage in source._stages
+        ):
+            array, remaining = _vectorize_stages(array, source._stages)
+
+            if not remaining:
+                return array
+
+    return None
+
+
+def _run_stages(stages: tuple[_Stage, ...], source: Iterable[Any]) -> Iterator[Any]:
+    if _ndarray(source) is not None:
+        source, stages = _vectorize_stages(source, stages)
+
+        if not stages:
+            return iter(source)
+
+    if len(stages) == 1:
+        kind, func, _ = stages[0]
+        func = as_callable(func)
+
+        # A single stage is fastest using the builtins, which run entirely in C
+        return filter(func, source) if kind == "where" else map(func, source)
+
+    fused = _compile_stages(tuple(stage.kind for stage in stages))
+
+    return fused(source, *(as_callable(stage.func) for stage in stages))
+
+
+def _callable[T, TOut](func: Callable[[T], TOut]) -> Callable[[T], TOut]:
+    """The plain callable for a function passed to an extension method, timed if a
+    profile is being recorded."""
+    return instrument(as_callable(func))
+
+
+def _fuse(source: Iterable[Any], stage: _Stage) -> Iterable[Any]:
+    if recording():
+        instrumented = instrument_stage(stage.kind, as_callable(stage.func))
+        if instrumented is not None:
+            stage = _Stage(stage.kind, *instrumented)
+
+    length = "exact" if stage.kind == "select" else "bounded"
+
+    if isinstance(source, _FusedIterable):
+        return _FusedIterable(
+            source._source,
+            source._stages + (stage,),
+            length if source._length == "exact" else "bounded",
+        )
+
+    return _FusedIterable(source, (stage,), length)
+
+
+_MISSING: Any = object()
+
+
+class _Descending:
+    """Wraps a key such that it sorts in reverse order, for use in min-heaps."""
+
+    __slots__ = ("key",)
+
+    def __init__(self, key: Any):
+        self.key = key
+
+    def __lt__(self, other: "_Descending") -> bool:
+        return other.key < self.key
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Descending) and self.key == other.key
+
+
+def _heap_sorted[T](
+    source: Iterable[T],
+    key_selector: Callable[[T], Any],
+    reverse: bool,
+) -> Iterator[tuple[Any, T]]:
+    # The index breaks ties between equal keys, which keeps the sort stable and
+    # avoids comparing the elements themselves
+    elements = list(source)
+    keys = map(key_selector, elements)
+    if reverse:
+        keys = map(_Descending, keys)
+
+    heap = list(zip(keys, itertools.count(), elements))
+
+    heapq.heapify(heap)
+
+    while heap:
+        key, _, element = heapq.heappop(heap)
+
+        yield (key.key if reverse else key), element
+
+
+def _decorate[T](
+    source: Iterable[T],
+    key_selector: Callable[[T], Any],
+) -> Iterator[tuple[Any, T]]:
+    for element in source:
+        yield key_selector(element), element
+
+
+def _decorate_sorted[T](
+    source: Iterable[T],
+    key_selector: Callable[[T], Any],
+    reverse: bool,
+) -> list[tuple[Any, T]]:
+    # Decorate-sort-undecorate: each key is computed exactly once, and remains
+    # available to the consumer alongside its element
+    elements = list(source)
+
+    decorated = list(zip(map(key_selector, elements), elements))
+    decorated.sort(key=operator.itemgetter(0), reverse=reverse)
+
+    return decorated
+
+
+class _OrderedIterable[T](ReusableIterable[T, T]):
+    """The sorted view of a source, as produced by `order_by` and `order_by_descending`.
+
+    Sorting is postponed until iteration, so that consumers that only need the first few
+    elements (`first`, `first_or_none`, `take`) can select those without sorting the
+    entire source.
+
+    In lazy mode, the source is heapified on the first request for an element, and each
+    subsequent element is popped from the heap on demand. With a run size, the source is
+    sorted in runs that are spilled to disk, and merged on demand.
+
+    Unless sorted with a run size, the sorted elements are kept once they have all been
+    produced, and replayed by subsequent iterations without sorting again.
+    """
+
+    def __init__(
+        self,
+        source: Iterable[T],
+        key_selector: Callable[[T], Any],
+        reverse: bool,
+        lazy: bool = False,
+        run_size: int | None = None,
+        compress: bool = False,
+    ):
+        def _func(source: Iterable[T]) -> Iterator[T]:
+            if self._sorted is not None:
+                return iter(self._sorted)
+
+            if lazy or run_size is not None:
+                return map(operator.itemgetter(1), self._keyed(source))
+
+            self._sorted = sorted(source, key=key_selector, reverse=reverse)
+
+            return iter(self._sorted)
+
+        if run_size is not None:
+            memory = f"one run of {run_size} elements"
+            optimization = (
+                f"external merge sort: runs of {run_size} elements spilled to disk"
+            )
+        elif lazy:
+            memory = "all elements, as a heap"
+            optimization = "lazy: heapified in O(n), each element popped in O(log n)"
+        else:
+            memory = "all elements"
+            optimization = None
+
+        super().__init__(
+            source,
+            _func,
+            length="exact",
+            name="order_by_descending" if reverse else "order_by",
+            memory=memory,
+            materializes=True,
+            optimization=optimization,
+        )
+
+        self._key_selector = key_selector
+        self._reverse = reverse
+        self._lazy = lazy
+        self._run_size = run_size
+        self._compress = compress
+        self._sorted: list[T] | None = None
+
+    def _exact_length(self) -> int | None:
+        if self._sorted is not None:
+            return len(self._sorted)
+
+        return super()._exact_length()
+
+    def _keyed(self, source: Iterable[T]) -> Iterator[tuple[Any, T]]:
+        """Iterates the sorted (key, element) pairs, so that consumers sharing the same
+        key selector can reuse the keys instead of computing them again.
+        """
+        if self._sorted is not None:
+            return zip(map(self._key_selector, self._sorted), self._sorted)
+
+        if self._run_size is not None:
+            return external_sorted(
+                _decorate(source, self._key_selector),
+                self._reverse,
+                self._run_size,
+                self._compress,
+            )
+
+        if self._lazy:
+            return self._keep(_heap_sorted(source, self._key_selector, self._reverse))
+
+        decorated = _decorate_sorted(source, self._key_selector, self._reverse)
+        self._sorted = [element for _, element in decorated]
+
+        return iter(decorated)
+
+    def _keep(self, pairs: Iterator[tuple[Any, T]]) -> Iterator[tuple[Any, T]]:
+        """Produces the sorted pairs, keeping the elements once all have been produced."""
+        elements = []
+
+        for pair in pairs:
+            elements.append(pair[1])
+            yield pair
+
+        self._sorted = elements
+
+    def _take(self, count: int) -> Iterator[T]:
+        """Iterates the first `count` elements, selected in O(n log k) time and O(k)
+        memory.
+
+        Equivalent to `itertools.islice(self, count)`, including the order of equal
+        elements.
+        """
+        return self._apply(lambda source: iter(self._top(count, source)))
+
+    def _top(self, count: int, source: Iterable[T]) -> list[T]:
+        if count <= 0:
+            return []
+
+        if self._sorted is not None:
+            return self._sorted[:count]
+
+        if count == 1:
+            extreme = builtins.max if self._reverse else builtins.min
+            value = extreme(source, key=self._key_selector, default=_MISSING)
+
+            return [] if value is _MISSING else [value]
+
+        select_top = heapq.nlargest if self._reverse else heapq.nsmallest
+
+        return select_top(count, source, key=self._key_selector)
+
+
+class _OrderedTake[T](ReusableIterable[T, T]):
+    """The first `count` elements of an `_OrderedIterable`, as produced by `take`,
+    selected from its unsorted input rather than sorting it entirely."""
+
+    def __init__(self, ordered: _OrderedIterable[T], count: int):
+        def _func(source: Iterable[T]) -> Iterator[T]:
+            return cast(_OrderedIterable[T], source)._take(count)
+
+        super().__init__(
+            ordered,
+            _func,
+            length="bounded",
+            name="take",
+            memory=f"{count} elements",
+            materializes=True,
+            optimization=(
+                f"top-{count} selection from the unsorted input of the preceding stage"
+            ),
+        )
+
+
+def _exact_length(source: Iterable[Any]) -> int | None:
+    """The number of elements in `source`, if it is known without iterating it."""
+    if isinstance(source, Sized):
+        return len(source)
+
+    if isinstance(source, ReusableIterable):
+        return source._exact_length()
+
+    return None
+
+
+def _max_length(source: Iterable[Any]) -> int | None:
+    """An upper bound on the number of elements in `source`, if it is known without
+    iterating it."""
+    if isinstance(source, Sized):
+        return len(source)
+
+    if isinstance(source, ReusableIterable):
+        return source._max_length()
+
+    return None
+
+
+def _reversed[T](source: Iterable[T]) -> Iterator[T] | None:
+    """Iterates `source` from back to front, if possible without iterating it entirely."""
+    if isinstance(source, Reversible):
+        return reversed(source)
+
+    if isinstance(source, _FusedIterable) and source._length == "exact":
+        reversed_source = _reversed(source._source)
+
+        if reversed_source is not None:
+            return source._func(reversed_source)
+
+    return None
+
 
 class any[T](Extension[Iterable[T], [Callable[[T], bool] | None], bool]):
     @overload
@@ -55,6 +695,9 @@ class any[T](Extension[Iterable[T], [Callable[[T], bool] | None], bool]):
             ```
         """
 
+        if predicate is not None:
+            predicate = _callable(predicate)
+
         def _any(
             source: Iterable[T],
             predicate: Callable[[T], bool] | None,
@@ -67,6 +710,10 @@ class any[T](Extension[Iterable[T], [Callable[[T], bool] | None], bool]):
 
                 return False
             else:
+                length = _exact_length(source)
+                if length is not None:
+                    return length > 0
+
                 try:
                     next(iter(source))
                 except StopIteration:
@@ -77,6 +724,271 @@ class any[T](Extension[Iterable[T], [Callable[[T], bool] | None], bool]):
         super().__init__(_any, predicate)
 
 
+_CACHE_BATCH_SIZE = 1_000
+"""Maximum number of elements `cache` computes at a time while filling its buffer."""
+
+
+class _CachedIterable[T](ReusableIterable[T, T]):
+    """Replays the elements of its source from a buffer that is filled lazily, by
+    whichever iterator first requests an element beyond the end of the buffer.
+
+    When a limit is exceeded the buffer is evicted, and the source is recomputed on
+    every subsequent iteration.
+    """
+
+    def __init__(
+        self,
+        source: Iterable[T],
+        max_elements: int | None,
+        max_bytes: int | None,
+    ):
+        def _func(source: Iterable[T]) -> Iterator[T]:
+            if self._complete:
+                return iter(self._buffer)
+
+            if self._evicted:
+                return iter(source)
+
+            return self._fill(source)
+
+        super().__init__(
+            source,
+            _func,
+            length="exact",
+            name="cache",
+            memory=(
+                "all elements"
+                if max_elements is None and max_bytes is None
+                else "all elements, until a limit is exceeded"
+            ),
+        )
+
+        self._max_elements = max_elements
+        self._max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._buffer: list[T] = []
+        self._bytes = 0
+        self._upstream: Iterator[T] | None = None
+        self._complete = False
+        self._evicted = False
+
+    def _exact_length(self) -> int | None:
+        return len(self._buffer) if self._complete else super()._exact_length()
+
+    def _fits(self, batch: list[T]) -> bool:
+        if (
+            self._max_elements is not None
+            and len(self._buffer) + len(batch) > self._max_elements
+        ):
+            return False
+
+        if self._max_bytes is not None:
+            self._bytes += builtins.sum(map(sys.getsizeof, batch))
+
+            return self._bytes <= self._max_bytes
+
+        return True
+
+    def _fill(self, source: Iterable[T]) -> Iterator[T]:
+        buffer = self._buffer
+        index = 0
+
+        while True:
+            if index < len(buffer):
+                remaining = buffer[index:]
+
+                yield from remaining
+                index += len(remaining)
+                continue
+
+            with self._lock:
+                if buffer is not self._buffer:
+                    # Evicted or reset by another iterator
+                    break
+
+                if index < len(buffer):
+                    continue
+
+                if self._complete:
+                    return
+
+                if self._upstream is None:
+                    self._upstream = iter(source)
+                upstream = self._upstream
+
+                # Reading in batches avoids taking the lock per element. The batch size
+                # grows with the number of elements cached so far, such that upstream is
+                # never computed more than an eighth ahead of what has been requested.
+                size = builtins.min(len(buffer) // 8 + 1, _CACHE_BATCH_SIZE)
+
+                batch: list[T] = []
+                error: BaseException | None = None
+
+                try:
+                    # Appended one by one, to yield the elements computed before an error
+                    for element in itertools.islice(upstream, size):
+                        batch.append(element)
+                except BaseException as e:
+                    # Start over on the next iteration rather than caching a partial result
+                    error = e
+
+                    self._buffer = []
+                    self._bytes = 0
+                    self._upstream = None
+                else:
+                    if self._fits(batch):
+                        buffer.extend(batch)
+
+                        if len(batch) < size:
+                            self._complete = True
+                            self._upstream = None
+
+                        continue
+
+                    # Limit exceeded: evict the buffer, and continue on the upstream
+                    # iterator without caching
+                    self._buffer = []
+                    self._upstream = None
+                    self._evicted = True
+
+            yield from batch
+
+            if error is not None:
+                raise error
+
+            yield from upstream
+            return
+
+        yield from itertools.islice(iter(self._source), index, None)
+
+
+class cache[T](Extension[Iterable[T], [int | None, int | None], Iterable[T]]):
+    def __init__(
+        self,
+        max_elements: int | None = None,
+        max_bytes: int | None = None,
+    ):
+        """Cache the elements of an iterable, such that repeated iterations replay the
+        elements instead of recomputing them.
+
+        The cache is filled lazily during the first iteration. Iterators that run
+        concurrently share the cache, so each element is computed only once.
+
+        Args:
+            max_elements (int | None, optional): Maximum number of elements to cache.
+                Defaults to None (unlimited).
+            max_bytes (int | None, optional): Maximum total size of the cached elements,
+                as measured by `sys.getsizeof`. Defaults to None (unlimited).
+
+        Note:
+            When a limit is exceeded the cache is discarded, and from then on every
+            iteration recomputes the elements from the input iterable. Iterators that
+            were already replaying from the discarded cache continue by recomputing
+            the remaining elements.
+
+        Example:
+            ```
+            source = [1, 2, 3]
+
+            def expensive(x: int) -> int:
+                print(f"Computing {x}")
+                return 2 * x
+
+            cached = source | select[int, int](expensive) | cache()
+
+            print(list(cached))
+            # Computing 1
+            # Computing 2
+            # Computing 3
+            # [2, 4, 6]
+
+            print(list(cached))
+            # [2, 4, 6]
+            ```
+        """
+
+        def _cache(
+            source: Iterable[T],
+            max_elements: int | None,
+            max_bytes: int | None,
+        ) -> Iterable[T]:
+            return _CachedIterable(source, max_elements, max_bytes)
+
+        super().__init__(_cache, max_elements, max_bytes)
+
+
+class chunk[T](
+    Extension[
+        Iterable[T],
+        [int, Literal["tuple", "list", "array"], str],
+        Iterable[Sequence[T]],
+    ]
+):
+    def __init__(
+        self,
+        size: int,
+        kind: Literal["tuple", "list", "array"] = "tuple",
+        typecode: str = "d",
+    ):
+        """Split an iterable into consecutive chunks of a fixed size. The last chunk may be
+        smaller.
+
+        Args:
+            size (int): The number of elements per chunk.
+            kind (Literal["tuple", "list", "array"], optional): The type of each chunk.
+                "array" produces an `array.array` of the given typecode, for numeric
+                elements. Defaults to "tuple".
+            typecode (str, optional): The typecode for chunks of kind "array", see
+                [`array`](https://docs.python.org/3/library/array.html).
+                Defaults to "d" (float).
+
+        Raises:
+            ValueError: If size is less than one, or kind is unknown.
+
+        Example:
+            ```
+            source = range(7)
+
+            chunks = source | chunk[int](3)
+
+            print(list(chunks))
+            # [(0, 1, 2), (3, 4, 5), (6,)]
+            ```
+        """
+        if size < 1:
+            raise ValueError("Size must be at least one.")
+        if kind not in ("tuple", "list", "array"):
+            raise ValueError(f"Unknown kind: {kind!r}.")
+
+        def _chunk(
+            source: Iterable[T],
+            size: int,
+            kind: Literal["tuple", "list", "array"],
+            typecode: str,
+        ) -> Iterable[Sequence[T]]:
+            def _func(source: Iterable[T]) -> Iterator[Sequence[T]]:
+                # Tuples produced by batched are allocated at their final size
+                chunks = itertools.batched(source, size)
+
+                if kind == "list":
+                    return map(list, chunks)
+                if kind == "array":
+                    return map(functools.partial(array.array, typecode), chunks)
+
+                return chunks
+
+            return ReusableIterable(
+                source,
+                _func,
+                length="bounded",
+                name="chunk",
+                memory=f"one chunk of {size} elements",
+            )
+
+        super().__init__(_chunk, size, kind, typecode)
+
+
 class count[T](Extension[Iterable[T], [], int]):
     def __init__(self):
         """Count the number of elements in an iterable.
@@ -90,55 +1002,235 @@ class count[T](Extension[Iterable[T], [], int]):
             ```
         """
 
-        def _count(source: Iterable[T]) -> int:
-            total = 0
-            for _ in source:
-                total += 1
+        def _count(source: Iterable[T]) -> int:
+            length = _exact_length(source)
+            if length is not None:
+                return length
+
+            array = _as_ndarray(source)
+            if array is not None:
+                return len(array)
+
+            # Consume in C, letting the counter keep track of the number of elements
+            counter = itertools.count()
+            deque(zip(source, counter), maxlen=0)
+
+            return next(counter)
+
+        super().__init__(_count)
+
+
+class distinct[T](Extension[Iterable[T], [int | None, bool, bool], Iterable[T]]):
+    def __init__(
+        self,
+        max_elements: int | None = None,
+        ordered: bool = True,
+        compress: bool = False,
+    ):
+        """Returns distinct elements from the iterable, in order of first occurrence.
+
+        Args:
+            max_elements (int | None, optional): If given, the number of distinct elements
+                to hold in memory. Beyond it, the elements seen so far and the remaining
+                elements are hash-partitioned to disk, and the partitions are
+                deduplicated one at a time, partitioning them again if they still hold
+                too many distinct elements. Elements must be picklable. Defaults to None
+                (unlimited).
+            ordered (bool, optional): Whether to keep the order of first occurrence once
+                elements are spilled, which requires the elements deduplicated from each
+                partition to be spilled again and merged. If False, they are produced
+                partition by partition instead. Only applies with max_elements. Defaults
+                to True.
+            compress (bool, optional): Whether to compress the spilled elements with
+                zlib, trading CPU time for disk space. Defaults to False.
+
+        Raises:
+            ValueError: If max_elements is less than one.
+
+        Note:
+            Without max_elements, every distinct element is held in memory. With it,
+            distinct elements are produced as they are read until the limit is reached;
+            the remaining ones only after the entire input has been read.
+
+        Example:
+            ```
+            source = [1, 3, 4, 1, 3, 7, 9, 3, 7]
+
+            result = source | distinct()
+
+            print(list(result))
+            # [1, 3, 4, 7, 9]
+            ```
+        """
+
+        if max_elements is not None and max_elements < 1:
+            raise ValueError("Max elements must be at least one.")
+
+        def _distinct(
+            source: Iterable[T],
+            max_elements: int | None,
+            ordered: bool,
+            compress: bool,
+        ) -> Iterable[T]:
+            def _func(source: Iterable[T]) -> Iterator[T]:
+                # unique_everseen - https://docs.python.org/3/library/itertools.html
+                seen = set()
+
+                for element in itertools.filterfalse(seen.__contains__, source):
+                    seen.add(element)
+                    yield element
+
+            def _func_spilled(source: Iterable[T]) -> Iterator[T]:
+                assert max_elements is not None
+
+                return map(
+                    operator.itemgetter(1),
+                    hash_distinct(enumerate(source), max_elements, ordered, compress),
+                )
+
+            if max_elements is None:
+                return ReusableIterable(
+                    source,
+                    _func,
+                    length="bounded",
+                    name="distinct",
+                    memory="every distinct element",
+                )
+
+            return ReusableIterable(
+                source,
+                _func_spilled,
+                length="bounded",
+                name="distinct",
+                memory=f"{max_elements} distinct elements",
+                optimization=(
+                    f"hash-partitioned to disk beyond {max_elements} distinct elements"
+                    + ("" if ordered else ", unordered")
+                ),
+            )
+
+        super().__init__(_distinct, max_elements, ordered, compress)
+
+
+def _plan_stage(
+    node: ReusableIterable[Any, Any], consumer: Iterable[Any] | None
+) -> PlanStage:
+    if isinstance(node, _OrderedIterable) and isinstance(consumer, _OrderedTake):
+        return PlanStage(
+            node._name,
+            optimizations=["not sorted: the next stage selects from its input"],
+        )
+
+    optimizations = []
+    if isinstance(node, _FusedIterable):
+        if len(node._stages) > 1:
+            optimizations.append(f"{len(node._stages)} stages fused into one loop")
+
+        if _ndarray(node._source) is not None:
+            vectorizable = len(
+                list(
+                    itertools.takewhile(
+                        lambda stage: _is_vectorizable(stage.func), node._stages
+                    )
+                )
+            )
+            if vectorizable:
+                optimizations.append(
+                    f"{vectorizable} of {len(node._stages)} stages vectorized with NumPy"
+                )
+
+    if node._optimization is not None:
+        optimizations.append(node._optimization)
 
-            return total
+    return PlanStage(
+        node._name,
+        lazy=not node._materializes,
+        memory=node._memory,
+        max_elements=None if node._memory is None else _max_length(node._source),
+        optimizations=optimizations,
+    )
 
-        super().__init__(_count)
 
+def _source_stage(source: Iterable[Any]) -> PlanStage:
+    if isinstance(source, _OneShot):
+        return PlanStage("one-shot iterator")
+
+    name = type(source).__name__
+    if isinstance(source, Sized):
+        name += f" of {len(source):,} elements"
+
+    return PlanStage(name)
 
-class distinct[T](Extension[Iterable[T], [], Iterable[T]]):
+
+class explain[T](Extension[Iterable[T], [], Plan]):
     def __init__(self):
-        """Returns distinct elements from the iterable.
+        """Describe the plan of a pipeline without iterating it: its stages, which of
+        them materialize their input, what they hold in memory, and which optimizations
+        apply.
+
+        Note:
+            Only the information that is available without iterating is reported. For
+            instance, stages over a NumPy array are reported as vectorized if their
+            functions can be vectorized, though a `where` is only vectorized if its
+            predicate results in a boolean array.
 
         Example:
             ```
-            source = [1, 3, 4, 1, 3, 7, 9, 3, 7]
+            plan = (
+                people
+                | where(F.age > 30)
+                | select(F.name)
+                | order_by(F)
+                | take(2)
+                | explain()
+            )
 
-            result = source | distinct()
+            print(plan)
+            # 1. list of 3 elements: lazy
+            # 2. where | select: lazy; 2 stages fused into one loop
+            # 3. order_by: lazy; not sorted: the next stage selects from its input
+            # 4. take: MATERIALIZES, holds 2 elements (reads at most 3 elements); ...
 
-            print(list(result))
-            # [1, 3, 4, 7, 9]
+            if plan.materializes:
+                ...
             ```
         """
 
-        def _distinct(source: Iterable[T]) -> Iterable[T]:
-            def _func(source: Iterable[T]) -> Iterator[T]:
-                # unique_everseen - https://docs.python.org/3/library/itertools.html
-                seen = set()
+        def _explain(source: Iterable[T]) -> Plan:
+            stages = []
+            consumer = None
 
-                for element in itertools.filterfalse(seen.__contains__, source):
-                    seen.add(element)
-                    yield element
+            while isinstance(source, ReusableIterable):
+                stages.append(_plan_stage(source, consumer))
+                consumer, source = source, source._source
+
+            stages.append(_source_stage(source))
+
+            return Plan(stages[::-1])
 
-            return ReusableIterable(source, _func)
+        super().__init__(_explain)
 
-        super().__init__(_distinct)
 
+def _group_sorted(
+    decorated: Iterable[tuple[Any, Any]],
+) -> Iterator[Grouping]:
+    for key, pairs in itertools.groupby(decorated, key=operator.itemgetter(0)):
+        yield Grouping(key, [element for _, element in pairs])
 
-class group_by[T, TKey: SupportsComparison](
+
+class group_by[T, TKey](
     Extension[
         Iterable[T],
-        [Callable[[T], TKey]],
+        [Callable[[T], TKey], GroupingStrategy, int | None, bool],
         Iterable[Grouping[T, TKey]],
     ]
 ):
     def __init__(
         self,
         key_selector: Callable[[T], TKey],
+        strategy: GroupingStrategy = "hash",
+        max_elements: int | None = None,
+        compress: bool = False,
     ):
         """Group the elements in an iterable based on a key.
 
@@ -146,11 +1238,44 @@ class group_by[T, TKey: SupportsComparison](
 
         Args:
             key_selector (Callable[[T], TKey]): Function to generate the key for each element.
+            strategy (GroupingStrategy, optional): How to form the groups. With "hash",
+                groups are formed in a single pass and returned in order of first occurrence of
+                their key; keys must be hashable. With "sort", the input is sorted by key and
+                groups are returned in order of their key; keys must be comparable. With
+                "consecutive", the input is assumed to be sorted or clustered by key already,
+                and each run of consecutive elements with equal keys forms a group that is
+                streamed without being materialized. Defaults to "hash".
+            max_elements (int | None, optional): If given, the number of elements to hold
+                in memory, beyond which elements are spilled to disk. With "hash", elements
+                are hash-partitioned by key to disk, and the partitions are grouped one at
+                a time, partitioning them again if they are still too large. With "sort",
+                the input is sorted in runs of this many elements that are merged from
+                disk, as with `order_by`. Keys and elements must be picklable. Has no effect
+                with "consecutive". Defaults to None (unlimited).
+            compress (bool, optional): Whether to compress the spilled elements with zlib,
+                trading CPU time for disk space. Defaults to False.
+
+        Raises:
+            ValueError: If the strategy is unknown, or max_elements is less than one.
 
         Note:
             While the returned `Grouping` object itself is an iterable that is evaluated lazily,
             the elements within each individual group are materialized into list when their group
-            is iterated. This may lead to memory issues in case of a large number of elements.
+            is iterated. This may lead to memory issues in case of a large number of elements,
+            unless max_elements is given. Even then, each group being produced is held in
+            memory entirely.
+
+            With the "hash" strategy and max_elements, groups are returned in order of
+            first occurrence of their key only if nothing was spilled.
+
+            With the "consecutive" strategy, nothing is materialized. In return, each group
+            can be iterated only once, and only before moving on to the next group.
+
+            The key selector is evaluated exactly once per element. When the input is the
+            result of `order_by` or `order_by_descending` with the same key selector object,
+            the keys computed for the ordering are reused and no additional sort is needed,
+            except for the "sort" strategy after `order_by_descending`. Groups are then
+            produced one at a time, regardless of max_elements.
 
         Example:
             ```
@@ -162,57 +1287,170 @@ class group_by[T, TKey: SupportsComparison](
 
             source = [
                 Person(10, "Arthur"),
-                Person(10, "Becky"),
-                Person(20, "Chris"),
+                Person(20, "Becky"),
+                Person(10, "Chris"),
                 Person(30, "Dave"),
                 Person(30, "Eduardo"),
-                Person(30, "Felice"),
+                Person(20, "Felice"),
             ]
 
             grouped = source | group_by[Person, int](lambda p: p.age)
 
             print(list(grouped))
             # [
-            #   10: [Person(age=10, name='Arthur'), Person(age=10, name='Becky')],
-            #   20: [Person(age=20, name='Chris')],
-            #   30: [Person(age=30, name='Dave'), Person(age=30, name='Eduardo'), Person(age=30, name='Felice')]
+            #   10: [Person(age=10, name='Arthur'), Person(age=10, name='Chris')],
+            #   20: [Person(age=20, name='Becky'), Person(age=20, name='Felice')],
+            #   30: [Person(age=30, name='Dave'), Person(age=30, name='Eduardo')]
             # ]
             ```
         """
+        if strategy not in ("hash", "sort", "consecutive"):
+            raise ValueError(f"Unknown strategy: {strategy!r}.")
+        if max_elements is not None and max_elements < 1:
+            raise ValueError("Max elements must be at least one.")
+
+        key_selector = _callable(key_selector)
 
         def _group_by(
             source: Iterable[T],
             key_selector: Callable[[T], TKey],
+            strategy: GroupingStrategy,
+            max_elements: int | None,
+            compress: bool,
         ) -> Iterable[Grouping[T, TKey]]:
-            def _func(source: Iterable[T]) -> Iterator[Grouping]:
-                groups = itertools.groupby(
-                    sorted(source, key=key_selector),
-                    key=key_selector,
+            def _func_hash(source: Iterable[T]) -> Iterator[Grouping]:
+                groups: defaultdict[TKey, list[T]] = defaultdict(list)
+
+                for element in source:
+                    groups[key_selector(element)].append(element)
+
+                for key, elements in groups.items():
+                    yield Grouping(key, elements)
+
+            def _func_sort(source: Iterable[T]) -> Iterator[Grouping]:
+                yield from _group_sorted(
+                    _decorate_sorted(source, key_selector, reverse=False)
+                )
+
+            def _func_hash_spilled(source: Iterable[T]) -> Iterator[Grouping]:
+                assert max_elements is not None
+
+                for key, elements in hash_grouped(
+                    _decorate(source, key_selector), max_elements, compress
+                ):
+                    yield Grouping(key, elements)
+
+            def _func_sort_spilled(source: Iterable[T]) -> Iterator[Grouping]:
+                assert max_elements is not None
+
+                yield from _group_sorted(
+                    external_sorted(
+                        _decorate(source, key_selector),
+                        reverse=False,
+                        run_size=max_elements,
+                        compress=compress,
+                    )
+                )
+
+            def _func_consecutive(source: Iterable[T]) -> Iterator[Grouping]:
+                for key, elements in itertools.groupby(source, key=key_selector):
+                    yield Grouping(key, elements)
+
+            if (
+                isinstance(source, _OrderedIterable)
+                and source._key_selector is key_selector
+                and not (strategy == "sort" and source._reverse)
+            ):
+                # Already ordered on the same key: equal keys are adjacent, so each
+                # strategy reduces to grouping consecutive elements, using the keys
+                # that were computed for the ordering. Descending order only matches
+                # the order of first occurrence, not the ascending order of "sort".
+                def _func_ordered(source: Iterable[T]) -> Iterator[Grouping]:
+                    ordered = cast(_OrderedIterable[T], source)
+
+                    yield from _group_sorted(ordered._apply(ordered._keyed))
+
+                return ReusableIterable(
+                    source,
+                    _func_ordered,
+                    length="bounded",
+                    name="group_by",
+                    memory="one group",
+                    optimization="reuses the order and keys of the preceding stage",
+                )
+
+            if strategy == "consecutive":
+                return ReusableIterable(
+                    source,
+                    _func_consecutive,
+                    length="bounded",
+                    name="group_by",
+                    optimization="streams groups of consecutive elements",
                 )
 
-                for key, elements in groups:
-                    yield Grouping(key, list(elements))
+            if max_elements is None:
+                return ReusableIterable(
+                    source,
+                    _func_hash if strategy == "hash" else _func_sort,
+                    length="bounded",
+                    name="group_by",
+                    memory="all elements",
+                    materializes=True,
+                )
 
-            return ReusableIterable(source, _func)
+            return ReusableIterable(
+                source,
+                _func_hash_spilled if strategy == "hash" else _func_sort_spilled,
+                length="bounded",
+                name="group_by",
+                memory=f"{max_elements} elements",
+                materializes=True,
+                optimization=(
+                    f"grace hash: partitioned to disk beyond {max_elements} elements"
+                    if strategy == "hash"
+                    else f"external merge sort: runs of {max_elements} elements "
+                    "spilled to disk"
+                ),
+            )
 
-        super().__init__(_group_by, key_selector)
+        super().__init__(_group_by, key_selector, strategy, max_elements, compress)
 
 
 class order_by[T, TKey: SupportsComparison](
-    Extension[Iterable[T], [Callable[[T], TKey]], Iterable[T]]
+    Extension[Iterable[T], [Callable[[T], TKey], bool, int | None, bool], Iterable[T]]
 ):
     def __init__(
         self,
         key_selector: Callable[[T], TKey],
+        lazy: bool = False,
+        run_size: int | None = None,
+        compress: bool = False,
     ):
         """Order the elements in an iterable based on a key in ascending order.
 
         Args:
             key_selector (Callable[[T], TKey]): Function to generate the key for each element.
+            lazy (bool, optional): Whether to heapify the input in O(n) and produce each
+                subsequent element on demand in O(log n), instead of sorting the entire
+                input before yielding the first element. Useful when typically only a
+                prefix of the result is consumed. Defaults to False.
+            run_size (int | None, optional): If given, the input is sorted in runs of this
+                many elements, which are spilled to disk and merged while iterating, such
+                that no more than one run is held in memory. Keys and elements must be
+                picklable. Defaults to None, i.e. sorting the entire input in memory.
+            compress (bool, optional): Whether to compress the spilled runs with zlib,
+                trading CPU time for disk space. Defaults to False.
+
+        Raises:
+            ValueError: If run_size is less than one, or is combined with lazy.
 
         Note:
             `order_by` materializes the entire input iterable, i.e. does not evaluate lazily.
-            This may lead to memory issues in case of large iterables.
+            This may lead to memory issues in case of large iterables, unless a run_size
+            is given.
+
+            When followed directly by `first`, `first_or_none` or `take`, only the requested
+            number of elements is kept in memory and the input is not sorted entirely.
 
         Example:
             ```
@@ -238,30 +1476,67 @@ class order_by[T, TKey: SupportsComparison](
 
             ```
         """
+        if run_size is not None and run_size < 1:
+            raise ValueError("Run size must be at least one.")
+        if run_size is not None and lazy:
+            raise ValueError("A run size cannot be combined with lazy ordering.")
+
+        key_selector = _callable(key_selector)
 
         def _order_by(
-            source: Iterable[T], key_selector: Callable[[T], TKey]
+            source: Iterable[T],
+            key_selector: Callable[[T], TKey],
+            lazy: bool,
+            run_size: int | None,
+            compress: bool,
         ) -> Iterable[T]:
-            return sorted(source, key=key_selector)
+            return _OrderedIterable(
+                source,
+                key_selector,
+                reverse=False,
+                lazy=lazy,
+                run_size=run_size,
+                compress=compress,
+            )
 
-        super().__init__(_order_by, key_selector)
+        super().__init__(_order_by, key_selector, lazy, run_size, compress)
 
 
 class order_by_descending[T, TKey: SupportsComparison](
-    Extension[Iterable[T], [Callable[[T], TKey]], Iterable[T]]
+    Extension[Iterable[T], [Callable[[T], TKey], bool, int | None, bool], Iterable[T]]
 ):
     def __init__(
         self,
         key_selector: Callable[[T], TKey],
+        lazy: bool = False,
+        run_size: int | None = None,
+        compress: bool = False,
     ):
         """Order the elements in an iterable based on a key in descending order.
 
         Args:
             key_selector (Callable[[T], TKey]): Function to generate the key for each element.
+            lazy (bool, optional): Whether to heapify the input in O(n) and produce each
+                subsequent element on demand in O(log n), instead of sorting the entire
+                input before yielding the first element. Useful when typically only a
+                prefix of the result is consumed. Defaults to False.
+            run_size (int | None, optional): If given, the input is sorted in runs of this
+                many elements, which are spilled to disk and merged while iterating, such
+                that no more than one run is held in memory. Keys and elements must be
+                picklable. Defaults to None, i.e. sorting the entire input in memory.
+            compress (bool, optional): Whether to compress the spilled runs with zlib,
+                trading CPU time for disk space. Defaults to False.
+
+        Raises:
+            ValueError: If run_size is less than one, or is combined with lazy.
 
         Note:
             `order_by_descending` materializes the entire input iterable, i.e. does not
-            evaluate lazily. This may lead to memory issues in case of large iterables.
+            evaluate lazily. This may lead to memory issues in case of large iterables,
+            unless a run_size is given.
+
+            When followed directly by `first`, `first_or_none` or `take`, only the requested
+            number of elements is kept in memory and the input is not sorted entirely.
 
         Example:
             ```
@@ -287,13 +1562,330 @@ class order_by_descending[T, TKey: SupportsComparison](
 
             ```
         """
+        if run_size is not None and run_size < 1:
+            raise ValueError("Run size must be at least one.")
+        if run_size is not None and lazy:
+            raise ValueError("A run size cannot be combined with lazy ordering.")
+
+        key_selector = _callable(key_selector)
 
         def _order_by(
-            source: Iterable[T], key_selector: Callable[[T], TKey]
+            source: Iterable[T],
+            key_selector: Callable[[T], TKey],
+            lazy: bool,
+            run_size: int | None,
+            compress: bool,
+        ) -> Iterable[T]:
+            return _OrderedIterable(
+                source,
+                key_selector,
+                reverse=True,
+                lazy=lazy,
+                run_size=run_size,
+                compress=compress,
+            )
+
+        super().__init__(_order_by, key_selector, lazy, run_size, compress)
+
+
+def _apply_selector[TIn, TOut](
+    selector: Callable[[TIn], TOut],
+    chunk: tuple[TIn, ...],
+) -> list[TOut]:
+    return list(map(selector, chunk))
+
+
+def _apply_batch_selector[TIn, TOut](
+    selector: Callable[[list[TIn]], Sequence[TOut]],
+    chunk: tuple[TIn, ...],
+) -> Sequence[TOut]:
+    results = selector(list(chunk))
+
+    if len(results) != len(chunk):
+        raise ValueError(
+            f"Selector returned {len(results)} results for a batch of {len(chunk)} elements."
+        )
+
+    return results
+
+
+def _map_concurrently[TIn, TOut](
+    executor: Executor,
+    chunk_selector: Callable[[tuple[TIn, ...]], Sequence[TOut]],
+    source: Iterable[TIn],
+    chunk_size: int,
+    max_in_flight: int,
+    ordered: bool,
+) -> Iterator[TOut]:
+    """Maps chunks of the source on the executor using `chunk_selector`, with at most
+    `max_in_flight` chunks submitted but not yet yielded. Shuts down the executor when
+    done or closed."""
+    chunks = itertools.batched(source, chunk_size)
+
+    try:
+        if ordered:
+            queue: deque[Future[Sequence[TOut]]] = deque()
+
+            for chunk in chunks:
+                if len(queue) >= max_in_flight:
+                    yield from queue.popleft().result()
+
+                queue.append(executor.submit(chunk_selector, chunk))
+
+            while queue:
+                yield from queue.popleft().result()
+        else:
+            pending: set[Future[Sequence[TOut]]] = set()
+
+            for chunk in chunks:
+                if len(pending) >= max_in_flight:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+                    for future in done:
+                        yield from future.result()
+
+                pending.add(executor.submit(chunk_selector, chunk))
+
+            for future in as_completed(pending):
+                yield from future.result()
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+class parallel_select[TIn, TOut](
+    Extension[
+        Iterable[TIn],
+        [
+            Callable[[TIn], TOut],
+            int | None,
+            int,
+            int | None,
+            bool,
+            BaseContext | None,
+        ],
+        Iterable[TOut],
+    ]
+):
+    def __init__(
+        self,
+        selector: Callable[[TIn], TOut],
+        max_workers: int | None = None,
+        chunk_size: int = 1_000,
+        max_in_flight: int | None = None,
+        ordered: bool = True,
+        mp_context: BaseContext | None = None,
+    ):
+        """Transform each element in an iterable according to a selector function, using
+        a pool of worker processes. Suited for CPU-bound selectors.
+
+        Elements are sent to the workers in chunks, and at most `max_in_flight` chunks are
+        being processed or waiting to be consumed at any time, so memory use does not
+        grow with the size of the input.
+
+        Args:
+            selector (Callable[[TIn], TOut]): Function to transform each element. Must be
+                picklable, e.g. a function defined at module level (not a lambda).
+            max_workers (int | None, optional): Number of worker processes. Defaults to
+                None, i.e. the number of processors.
+            chunk_size (int, optional): Number of elements sent to a worker at once.
+                Defaults to 1000.
+            max_in_flight (int | None, optional): Maximum number of chunks in flight.
+                Defaults to None, i.e. twice the number of workers.
+            ordered (bool, optional): Whether to preserve the order of the input. If False,
+                chunks are yielded as soon as they are done. Defaults to True.
+            mp_context (BaseContext | None, optional): The multiprocessing context used to
+                start the worker processes. Defaults to None, i.e. the "forkserver" start
+                method where available, and "spawn" otherwise. Unlike "fork", these are
+                safe to use from a multi-threaded process.
+
+        Note:
+            A new process pool is started for each iteration, and shut down when the
+            iteration completes or is abandoned. Elements and results are pickled to be
+            sent between processes.
+
+        Example:
+            ```
+            def feature(x: int) -> int:
+                return sum(i * i for i in range(x))
+
+            source = range(5)
+
+            transformed = source | parallel_select[int, int](feature, max_workers=4)
+
+            print(list(transformed))
+            # [0, 0, 1, 5, 14]
+            ```
+        """
+        if isinstance(selector, Expression):
+            # Unlike its compiled form, the expression itself can be pickled
+            selector = functools.partial(evaluate, selector)
+
+        def _parallel_select(
+            source: Iterable[TIn],
+            selector: Callable[[TIn], TOut],
+            max_workers: int | None,
+            chunk_size: int,
+            max_in_flight: int | None,
+            ordered: bool,
+            mp_context: BaseContext | None,
+        ) -> Iterable[TOut]:
+            def _func(source: Iterable[TIn]) -> Iterator[TOut]:
+                workers = max_workers or os.cpu_count() or 1
+
+                return _map_concurrently(
+                    ProcessPoolExecutor(workers, mp_context or _default_mp_context()),
+                    functools.partial(_apply_selector, selector),
+                    source,
+                    chunk_size,
+                    max_in_flight or 2 * workers,
+                    ordered,
+                )
+
+            return ReusableIterable(
+                source,
+                _func,
+                length="exact",
+                name="parallel_select",
+                memory="the chunks in flight",
+            )
+
+        super().__init__(
+            _parallel_select,
+            selector,
+            max_workers,
+            chunk_size,
+            max_in_flight,
+            ordered,
+            mp_context,
+        )
+
+
+def _default_mp_context() -> BaseContext:
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+
+    return multiprocessing.get_context("spawn")
+
+
+def _root(source: Iterable[Any]) -> Iterable[Any]:
+    """The iterable that a pipeline ultimately reads from."""
+    while isinstance(source, ReusableIterable):
+        source = source._source
+
+    return source
+
+
+def _iterate[T](source: Iterable[T]) -> Iterator[T]:
+    # Unlike iter(source), does not start iterating until the first element is requested
+    yield from source
+
+
+class _ReplayedIterable[T](ReusableIterable[T, T]):
+    """Replays the elements of a pipeline over a one-shot source, or of the one-shot
+    source itself, from a `ReplayBuffer` that is created on the first iteration."""
+
+    def __init__(
+        self,
+        source: Iterable[T],
+        max_elements: int | None,
+        spill: bool,
+        compress: bool,
+    ):
+        def _func(source: Iterable[T]) -> Iterator[T]:
+            with self._lock:
+                if self._buffer is None:
+                    self._buffer = ReplayBuffer(
+                        _iterate(source), max_elements, spill, compress
+                    )
+
+            return iter(self._buffer)
+
+        super().__init__(
+            source,
+            _func,
+            length="exact",
+            name="replay",
+            memory=(
+                "every element read"
+                if max_elements is None
+                else f"up to {max_elements:,} elements read"
+            ),
+            optimization=(
+                f"spilled to disk beyond {max_elements:,} elements" if spill else None
+            ),
+        )
+
+        self._lock = threading.Lock()
+        self._buffer: ReplayBuffer[T] | None = None
+
+
+class replay[T](Extension[Iterable[T], [int | None, bool, bool], Iterable[T]]):
+    def __init__(
+        self,
+        max_elements: int | None = None,
+        spill: bool = False,
+        compress: bool = False,
+    ):
+        """Make a one-shot iterator, such as a generator or file object, reusable.
+
+        Elements are buffered as they are first read, and replayed on subsequent
+        iterations. Iterators that run concurrently share the buffer, so each element
+        is read from the source only once. When applied to the result of other extension
+        methods over a one-shot iterator, their results are buffered instead. Sources
+        that can be iterated repeatedly already, such as lists, or pipelines over them,
+        are left as they are.
+
+        Args:
+            max_elements (int | None, optional): Maximum number of elements to buffer in
+                memory. Defaults to None (unlimited).
+            spill (bool, optional): Whether to spill the elements beyond max_elements to
+                a temporary file on disk, rather than discarding the buffer. Elements
+                must be picklable. Defaults to False.
+            compress (bool, optional): Whether to compress the spilled elements with
+                zlib, trading CPU time for disk space. Defaults to False.
+
+        Raises:
+            ValueError: If max_elements is less than one, or spill is given without
+                max_elements.
+
+        Note:
+            Without spill, the buffer is discarded when max_elements is exceeded. The
+            iterator that exceeded it continues reading the source, and any other
+            iteration raises a `RuntimeError`, as the elements can no longer be
+            replayed. With spill, elements that cannot be pickled raise an error.
+
+        Example:
+            ```
+            source = (x for x in [1, 2, 3])
+
+            replayed = source | replay()
+
+            print(list(replayed))
+            # [1, 2, 3]
+
+            print(list(replayed))
+            # [1, 2, 3]
+            ```
+        """
+        if max_elements is not None and max_elements < 1:
+            raise ValueError("Max elements must be at least one.")
+        if spill and max_elements is None:
+            raise ValueError("Spill requires max_elements.")
+
+        def _replay(
+            source: Iterable[T],
+            max_elements: int | None,
+            spill: bool,
+            compress: bool,
         ) -> Iterable[T]:
-            return sorted(source, key=key_selector, reverse=True)
+            if not isinstance(source, Iterator) and not isinstance(
+                _root(source), _OneShot
+            ):
+                return source
 
-        super().__init__(_order_by, key_selector)
+            return _ReplayedIterable(source, max_elements, spill, compress)
+
+        super().__init__(_replay, max_elements, spill, compress)
 
 
 class select[TIn, TOut](
@@ -326,12 +1918,93 @@ class select[TIn, TOut](
         def _select(
             source: Iterable[TIn], selector: Callable[[TIn], TOut]
         ) -> Iterable[TOut]:
+            return _fuse(source, _Stage("select", selector))
+
+        super().__init__(_select, selector)
+
+
+class select_batch[TIn, TOut](
+    Extension[
+        Iterable[TIn],
+        [Callable[[list[TIn]], Sequence[TOut]], int, int],
+        Iterable[TOut],
+    ]
+):
+    def __init__(
+        self,
+        selector: Callable[[list[TIn]], Sequence[TOut]],
+        size: int,
+        prefetch: int = 0,
+    ):
+        """Transform the elements in an iterable in batches, calling the selector function
+        once per batch instead of once per element. Suited for selectors with a high fixed
+        cost per call, such as model inference or database queries.
+
+        Args:
+            selector (Callable[[list[TIn]], Sequence[TOut]]): Function to transform a batch of
+                elements. Must return one result per element, in the same order.
+            size (int): The number of elements per batch. The last batch may be smaller.
+            prefetch (int, optional): Number of batches to transform ahead in a background
+                thread, while the results of the current batch are being consumed.
+                Defaults to 0, i.e. transform each batch only when its results are needed.
+
+        Raises:
+            ValueError: If size is less than one, prefetch is negative, or the selector
+                returns a different number of results than elements it was given.
+
+        Example:
+            ```
+            def double(batch: list[int]) -> list[int]:
+                print(f"Called with {len(batch)} elements")
+                return [2 * x for x in batch]
+
+            source = range(5)
+
+            transformed = source | select_batch[int, int](double, 3)
+
+            print(list(transformed))
+            # Called with 3 elements
+            # Called with 2 elements
+            # [0, 2, 4, 6, 8]
+            ```
+        """
+        if size < 1:
+            raise ValueError("Size must be at least one.")
+        if prefetch < 0:
+            raise ValueError("Prefetch must not be negative.")
+
+        def _select_batch(
+            source: Iterable[TIn],
+            selector: Callable[[list[TIn]], Sequence[TOut]],
+            size: int,
+            prefetch: int,
+        ) -> Iterable[TOut]:
+            batch_selector = functools.partial(_apply_batch_selector, selector)
+
             def _func(source: Iterable[TIn]) -> Iterator[TOut]:
-                return map(selector, source)
+                if prefetch:
+                    return _map_concurrently(
+                        ThreadPoolExecutor(1),
+                        batch_selector,
+                        source,
+                        size,
+                        prefetch + 1,
+                        ordered=True,
+                    )
+
+                return itertools.chain.from_iterable(
+                    map(batch_selector, itertools.batched(source, size))
+                )
 
-            return ReusableIterable(source, _func)
+            return ReusableIterable(
+                source,
+                _func,
+                length="exact",
+                name="select_batch",
+                memory=f"{prefetch + 1} batches of {size} elements",
+            )
 
-        super().__init__(_select, selector)
+        super().__init__(_select_batch, selector, size, prefetch)
 
 
 class first[T](Extension[Iterable[T], [], T]):
@@ -355,6 +2028,13 @@ class first[T](Extension[Iterable[T], [], T]):
         """
 
         def _first(source: Iterable[T]) -> T:
+            if isinstance(source, _OrderedIterable):
+                top = next(source._take(1), _MISSING)
+                if top is _MISSING:
+                    raise ValueError("Iterable is empty.")
+
+                return top
+
             try:
                 return next(iter(source))
             except StopIteration:
@@ -382,6 +2062,11 @@ class first_or_none[T](Extension[Iterable[T], [], T | None]):
         """
 
         def _first_or_none(source: Iterable[T]) -> T | None:
+            if isinstance(source, _OrderedIterable):
+                top = next(source._take(1), _MISSING)
+
+                return None if top is _MISSING else top
+
             try:
                 return next(iter(source))
             except StopIteration:
@@ -411,6 +2096,13 @@ class last[T](Extension[Iterable[T], [], T]):
         """
 
         def _last(source: Iterable[T]) -> T:
+            reversed_source = _reversed(source)
+            if reversed_source is not None:
+                try:
+                    return next(reversed_source)
+                except StopIteration:
+                    raise ValueError("Iterable contains no elements.")
+
             iterator = iter(source)
 
             try:
@@ -446,6 +2138,10 @@ class last_or_none[T](Extension[Iterable[T], [], T | None]):
         """
 
         def _last_or_none(source: Iterable[T]) -> T | None:
+            reversed_source = _reversed(source)
+            if reversed_source is not None:
+                return next(reversed_source, None)
+
             iterator = iter(source)
 
             try:
@@ -471,6 +2167,12 @@ class max[T: SupportsComparison](Extension[Iterable[T], [], T]):
         Raises:
             ValueError: If the iterable contains no elements.
 
+        Note:
+            For a NumPy array, or stages over one that can be vectorized, the maximum
+            is computed by NumPy. If it contains NaN, which NumPy propagates, the
+            elements are compared one by one instead, as for any other iterable, so
+            that the result matches that of the built-in `max`.
+
         Example:
             ```
             source = [4, 7, 2]
@@ -483,6 +2185,17 @@ class max[T: SupportsComparison](Extension[Iterable[T], [], T]):
         """
 
         def _max(source: Iterable[T]) -> T:
+            array = _as_ndarray(source)
+            if array is not None:
+                if not len(array):
+                    raise ValueError("Iterable is empty.")
+
+                value = array.max()
+                if value == value:  # Not NaN
+                    return value
+
+                source = array
+
             try:
                 return builtins.max(source)
             except ValueError:
@@ -500,6 +2213,12 @@ class min[T: SupportsComparison](Extension[Iterable[T], [], T]):
         Raises:
             ValueError: If the iterable contains no elements.
 
+        Note:
+            For a NumPy array, or stages over one that can be vectorized, the minimum
+            is computed by NumPy. If it contains NaN, which NumPy propagates, the
+            elements are compared one by one instead, as for any other iterable, so
+            that the result matches that of the built-in `min`.
+
         Example:
             ```
             source = [4, 7, 2]
@@ -512,6 +2231,17 @@ class min[T: SupportsComparison](Extension[Iterable[T], [], T]):
         """
 
         def _min(source: Iterable[T]) -> T:
+            array = _as_ndarray(source)
+            if array is not None:
+                if not len(array):
+                    raise ValueError("Iterable is empty.")
+
+                value = array.min()
+                if value == value:  # Not NaN
+                    return value
+
+                source = array
+
             try:
                 return builtins.min(source)
             except ValueError:
@@ -541,6 +2271,12 @@ class single[T](Extension[Iterable[T], [], T]):
         """
 
         def _single(source: Iterable[T]) -> T:
+            length = _exact_length(source)
+            if length == 0:
+                raise ValueError("Iterable is empty.")
+            if length is not None and length > 1:
+                raise ValueError("Iterable contains more than one element.")
+
             iterator = iter(source)
 
             try:
@@ -580,6 +2316,12 @@ class single_or_none[T](Extension[Iterable[T], [], T | None]):
         """
 
         def _single_or_none(source: Iterable[T]) -> T | None:
+            length = _exact_length(source)
+            if length == 0:
+                return None
+            if length is not None and length > 1:
+                raise ValueError("Iterable contains more than one element.")
+
             iterator = iter(source)
 
             try:
@@ -597,6 +2339,135 @@ class single_or_none[T](Extension[Iterable[T], [], T | None]):
         super().__init__(_single_or_none)
 
 
+class take[T](Extension[Iterable[T], [int], Iterable[T]]):
+    def __init__(
+        self,
+        count: int,
+    ):
+        """Take the first `count` elements of an iterable. Takes all elements if the
+        iterable contains fewer than `count` elements.
+
+        Args:
+            count (int): The number of elements to take.
+
+        Note:
+            When applied directly to the result of `order_by` or `order_by_descending`,
+            the first `count` elements are selected with a heap, in O(n log(count)) time
+            and O(count) memory, instead of sorting the entire input.
+
+        Example:
+            ```
+            source = [4, 7, 2, 9]
+
+            result = source | take(2)
+
+            print(list(result))
+            # [4, 7]
+            ```
+        """
+
+        def _take(source: Iterable[T], count: int) -> Iterable[T]:
+            if isinstance(source, _OrderedIterable):
+                return _OrderedTake(cast(_OrderedIterable[T], source), count)
+
+            def _func(source: Iterable[T]) -> Iterator[T]:
+                return itertools.islice(source, builtins.max(count, 0))
+
+            return ReusableIterable(source, _func, length="bounded", name="take")
+
+        super().__init__(_take, count)
+
+
+class threaded_select[TIn, TOut](
+    Extension[
+        Iterable[TIn],
+        [Callable[[TIn], TOut], int | None, int | None, int, bool],
+        Iterable[TOut],
+    ]
+):
+    def __init__(
+        self,
+        selector: Callable[[TIn], TOut],
+        max_workers: int | None = None,
+        max_in_flight: int | None = None,
+        chunk_size: int = 1,
+        ordered: bool = True,
+    ):
+        """Transform each element in an iterable according to a selector function, using
+        a pool of worker threads. Suited for selectors that block on I/O, such as reading
+        files or querying a database.
+
+        At most `max_in_flight` chunks are being processed or waiting to be consumed at any
+        time, so the input is read ahead by a bounded amount only.
+
+        Args:
+            selector (Callable[[TIn], TOut]): Function to transform each element.
+            max_workers (int | None, optional): Number of worker threads. Defaults to None,
+                i.e. `min(32, os.cpu_count() + 4)`.
+            max_in_flight (int | None, optional): Maximum number of chunks in flight.
+                Defaults to None, i.e. twice the number of workers.
+            chunk_size (int, optional): Number of elements handed to a thread at once.
+                Defaults to 1.
+            ordered (bool, optional): Whether to preserve the order of the input. If False,
+                chunks are yielded as soon as they are done. Defaults to True.
+
+        Note:
+            A new thread pool is started for each iteration, and shut down when the
+            iteration completes or is abandoned.
+
+        Example:
+            ```
+            paths = ["a.txt", "b.txt", "c.txt"]
+
+            contents = paths | threaded_select[str, str](
+                lambda p: Path(p).read_text(),
+                max_workers=8,
+            )
+
+            print(list(contents))
+            # ['contents of a', 'contents of b', 'contents of c']
+            ```
+        """
+        selector = _callable(selector)
+
+        def _threaded_select(
+            source: Iterable[TIn],
+            selector: Callable[[TIn], TOut],
+            max_workers: int | None,
+            max_in_flight: int | None,
+            chunk_size: int,
+            ordered: bool,
+        ) -> Iterable[TOut]:
+            def _func(source: Iterable[TIn]) -> Iterator[TOut]:
+                workers = max_workers or builtins.min(32, (os.cpu_count() or 1) + 4)
+
+                return _map_concurrently(
+                    ThreadPoolExecutor(workers),
+                    functools.partial(_apply_selector, selector),
+                    source,
+                    chunk_size,
+                    max_in_flight or 2 * workers,
+                    ordered,
+                )
+
+            return ReusableIterable(
+                source,
+                _func,
+                length="exact",
+                name="threaded_select",
+                memory="the chunks in flight",
+            )
+
+        super().__init__(
+            _threaded_select,
+            selector,
+            max_workers,
+            max_in_flight,
+            chunk_size,
+            ordered,
+        )
+
+
 class to_dictionary[T, TKey, TValue](
     Extension[
         Iterable[T],
@@ -651,7 +2522,10 @@ class to_dictionary[T, TKey, TValue](
             # {31: 'ARTHUR', 12: 'BECKY', 45: 'CHRIS'}
             ```
         """
-        if value_selector:
+        key_selector = _callable(key_selector)
+
+        if value_selector is not None:
+            value_selector = _callable(value_selector)
 
             def _to_dictionary_key_element(
                 source: Iterable[T],
@@ -724,10 +2598,17 @@ class where[T](
         """
 
         def _where(source: Iterable[T], predicate: Callable[[T], bool]) -> Iterable[T]:
+            return _fuse(source, _Stage("where", predicate))
 
-            def _func(source: Iterable[T]) -> Iterator[T]:
-                return (x for x in source if predicate(x))
+        super().__init__(_where, predicate)
 
-            return ReusableIterable(source, _func)
 
-        super().__init__(_where, predicate)
+# NumPy arrays implement `|` themselves, as an elementwise bitwise or. Opting out of
+# NumPy's ufunc protocol makes `array | extension` defer to `Extension.__ror__` instead.
+for _extension in list(globals().values()):
+    if (
+        isinstance(_extension, type)
+        and issubclass(_extension, Extension)
+        and _extension.__module__ == __name__
+    ):
+        setattr(_extension, "__array_ufunc__", None)
@@ -0,0 +1,318 @@
+import contextlib
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from contextvars import ContextVar
+from typing import Any
+
+_current: ContextVar["Profile | None"] = ContextVar("profile", default=None)
+
+# Per thread, the stages whose iterators are currently being advanced, innermost last
+_running = threading.local()
+
+
+def _stack() -> list["StageProfile"]:
+    stack = getattr(_running, "stack", None)
+    if stack is None:
+        stack = _running.stack = []
+
+    return stack
+
+
+class StageProfile:
+    """Measurements of a single stage of a pipeline, recorded by `profile`.
+
+    Times are in seconds and accumulate over all iterations of the stage.
+
+    Attributes:
+        name: The extension method(s) making up the stage, e.g. "group_by". Consecutive
+            `where` and `select` stages run in a single loop, which is reported as one
+            stage named after all of them, e.g. "where | select", with the measurements
+            per extension method in `stages`.
+        source: The stage the elements are read from, or None if read from a plain
+            iterable.
+        stages: For a single loop of `where` and `select` stages, the measurements per
+            extension method. Only their element counts and `callable_seconds` are
+            recorded.
+        iterations: The number of times the stage was iterated.
+        elements_in: The number of elements read from the source.
+        elements_out: The number of elements produced.
+        seconds: Time spent producing elements, including reading them from the source.
+        callable_seconds: Time spent in the functions that were passed to the extension
+            methods, such as predicates and key selectors.
+        first_element_seconds: Time from starting the first iteration until its first
+            element was produced, or None if none was produced.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        source: "StageProfile | None" = None,
+        stages: list["StageProfile"] | None = None,
+    ):
+        self.name = name
+        self.source = source
+        self.stages = stages or []
+        self.iterations = 0
+        self._elements_in = 0
+        self.elements_out = 0
+        self.seconds = 0.0
+        self._callable_seconds = 0.0
+        self.first_element_seconds: float | None = None
+
+    @property
+    def elements_in(self) -> int:
+        if self.stages:
+            return self.stages[0].elements_in
+        if self.source is not None:
+            return self.source.elements_out
+
+        return self._elements_in
+
+    @property
+    def callable_seconds(self) -> float:
+        return self._callable_seconds + sum(x.callable_seconds for x in self.stages)
+
+    @property
+    def self_seconds(self) -> float:
+        """Time spent in this stage itself, i.e. excluding its source stage."""
+        if self.source is None:
+            return self.seconds
+
+        return self.seconds - self.source.seconds
+
+    @property
+    def overhead_seconds(self) -> float:
+        """Time spent in this stage itself, other than in the functions that were passed
+        to the extension methods."""
+        return self.self_seconds - self.callable_seconds
+
+    def __repr__(self) -> str:
+        summary = f"{self.name}: {self.elements_in} in, {self.elements_out} out, "
+
+        if self.iterations:
+            summary += (
+                f"{self.seconds * 1e3:.3f} ms (self {self.self_seconds * 1e3:.3f} ms, "
+                f"callables {self.callable_seconds * 1e3:.3f} ms)"
+            )
+        else:
+            summary += f"callables {self.callable_seconds * 1e3:.3f} ms"
+
+        if self.first_element_seconds is not None:
+            summary += (
+                f", first element after {self.first_element_seconds * 1e3:.3f} ms"
+            )
+
+        return summary
+
+
+class Profile:
+    """The stages of all pipelines built while recording, see `profile`."""
+
+    def __init__(self):
+        self._stages: list[StageProfile] = []
+        # Per function, the function and its instrumented counterpart. Reusing the
+        # latter keeps functions that are passed to multiple extension methods
+        # identical, on which e.g. `group_by` relies to reuse the keys of `order_by`.
+        self._callables: dict[int, tuple[Callable[..., Any], Callable[..., Any]]] = {}
+
+    @property
+    def stages(self) -> list[StageProfile]:
+        """The last stage of each pipeline that was iterated. Preceding stages are
+        reachable through `StageProfile.source`."""
+        iterated = [stage for stage in self._stages if stage.iterations]
+
+        sources = set()
+        for stage in iterated:
+            source = stage.source
+            while source is not None:
+                sources.add(id(source))
+                source = source.source
+
+        return [stage for stage in iterated if id(stage) not in sources]
+
+    def __repr__(self) -> str:
+        lines = []
+
+        for stage in self.stages:
+            depth = 0
+            current: StageProfile | None = stage
+            while current is not None:
+                lines.append(f"{'  ' * depth}{current!r}")
+                lines += [f"{'  ' * (depth + 1)}- {x!r}" for x in current.stages]
+
+                current = current.source
+                depth += 1
+
+        return "\n".join(lines)
+
+
+@contextlib.contextmanager
+def profile() -> Iterator[Profile]:
+    """Record measurements of each stage of the pipelines built within the context.
+
+    For each stage, the number of elements in and out, the time spent, the part thereof
+    spent in the functions passed to the extension methods, and the time until the first
+    element are recorded. The pipelines may also be iterated after leaving the context.
+
+    Note:
+        Instrumentation adds overhead per element, and disables vectorization of NumPy
+        arrays. Time spent in functions running in other threads or processes, such as
+        those of `threaded_select` and `parallel_select`, is not attributed to callables.
+
+        A stage that the next stage reads through a shortcut, such as `order_by`
+        followed by `take`, records the work of the shortcut, and only the elements the
+        next stage reads from it as its output.
+
+    Example:
+        ```
+        with profile() as report:
+            result = source | where(F.age > 30) | group_by(F.city) | to_list()
+
+        print(report)
+        # group_by: 2 in, 1 out, 0.021 ms (self 0.012 ms, callables 0.002 ms), ...
+        #   where: 3 in, 2 out, 0.009 ms (self 0.009 ms, callables 0.003 ms), ...
+        #     - where: 3 in, 2 out, callables 0.003 ms
+
+        slowest = max(report.stages, key=lambda stage: stage.self_seconds)
+        ```
+    """
+    report = Profile()
+    token = _current.set(report)
+
+    try:
+        yield report
+    finally:
+        _current.reset(token)
+
+
+def recording() -> bool:
+    """Whether a profile is being recorded."""
+    return _current.get() is not None
+
+
+def register(
+    name: str,
+    source: StageProfile | None = None,
+    stages: list[StageProfile] | None = None,
+) -> StageProfile | None:
+    """A new stage of the profile being recorded, or None if none is."""
+    report = _current.get()
+    if report is None:
+        return None
+
+    stage = StageProfile(name, source, stages)
+    report._stages.append(stage)
+
+    return stage
+
+
+class _TimedCallable:
+    """Attributes the time spent in a function to the stage being advanced."""
+
+    def __init__(self, func: Callable[..., Any]):
+        self._func = func
+
+    def __call__(self, *args: Any) -> Any:
+        start = time.perf_counter()
+
+        try:
+            return self._func(*args)
+        finally:
+            stack = _stack()
+            if stack:
+                stack[-1]._callable_seconds += time.perf_counter() - start
+
+
+def instrument[**P, TOut](func: Callable[P, TOut]) -> Callable[P, TOut]:
+    """`func`, timed if a profile is being recorded."""
+    report = _current.get()
+    if report is None:
+        return func
+
+    _, timed = report._callables.setdefault(id(func), (func, _TimedCallable(func)))
+
+    return timed
+
+
+class _StageCallable:
+    """Records the elements in and out of a `where` or `select` stage, by counting the
+    calls to, and the results of, its function."""
+
+    def __init__(self, func: Callable[[Any], Any], stage: StageProfile, where: bool):
+        self._func = func
+        self._stage = stage
+        self._where = where
+
+    def __call__(self, element: Any) -> Any:
+        stage = self._stage
+        start = time.perf_counter()
+
+        try:
+            result = self._func(element)
+        finally:
+            stage._callable_seconds += time.perf_counter() - start
+            stage._elements_in += 1
+
+        if result or not self._where:
+            stage.elements_out += 1
+
+        return result
+
+
+def instrument_stage(
+    name: str,
+    func: Callable[[Any], Any],
+) -> tuple[Callable[[Any], Any], StageProfile] | None:
+    """A counting `func` and its stage, if a profile is being recorded."""
+    if _current.get() is None:
+        return None
+
+    stage = StageProfile(name)
+
+    return _StageCallable(func, stage, where=name == "where"), stage
+
+
+def _counted[T](stage: StageProfile, source: Iterable[T]) -> Iterator[T]:
+    for element in source:
+        stage._elements_in += 1
+        yield element
+
+
+def iterate[TIn, TOut](
+    stage: StageProfile,
+    func: Callable[[Iterable[TIn]], Iterator[TOut]],
+    source: Iterable[TIn],
+) -> Iterator[TOut]:
+    """Applies `func` to `source`, recording the measurements in `stage`."""
+    stack = _stack()
+    stage.iterations += 1
+
+    if stage.source is None and not stage.stages:
+        source = _counted(stage, source)
+
+    start = time.perf_counter()
+    stack.append(stage)
+    try:
+        iterator = func(source)
+    finally:
+        stack.pop()
+        stage.seconds += time.perf_counter() - start
+
+    while True:
+        resumed = time.perf_counter()
+        stack.append(stage)
+        try:
+            element = next(iterator)
+        except StopIteration:
+            return
+        finally:
+            stack.pop()
+            now = time.perf_counter()
+            stage.seconds += now - resumed
+
+        stage.elements_out += 1
+        if stage.first_element_seconds is None:
+            stage.first_element_seconds = now - start
+
+        yield element
@@ -1,5 +1,5 @@
-from collections.abc import Iterable
-from typing import Protocol, TypeAlias
+from collections.abc import Iterable, Sequence
+from typing import Literal, Protocol, TypeAlias
 
 
 class SupportsGreaterThan[T](Protocol):
@@ -12,6 +12,10 @@ class SupportsLessThan[T](Protocol):
 
 SupportsComparison: TypeAlias = SupportsGreaterThan | SupportsLessThan
 
+GroupingStrategy: TypeAlias = Literal["hash", "sort", "consecutive"]
+"""How `group_by` forms its groups: by hashing the keys, by sorting on the keys, or
+by taking runs of consecutive equal keys in input that is already sorted or clustered."""
+
 
 class Grouping[T, TKey](Iterable[T]):
     """A wrapper around an iterable, that also holds its grouping key.
@@ -38,3 +42,66 @@ class Grouping[T, TKey](Iterable[T]):
 
     def __iter__(self):
         return iter(self._source)
+
+
+class PlanStage:
+    """A single stage in the plan of a pipeline, as described by `explain`.
+
+    Attributes:
+        name: The extension method(s) making up the stage, or the type of the source.
+        lazy: Whether the stage produces elements while reading its source. If False,
+            the stage reads its entire source before producing the first element.
+        memory: What the stage holds in memory, or None if it holds no more than a few
+            elements at a time.
+        max_elements: An upper bound on the number of elements the stage reads, if it is
+            known without iterating. Only given for stages that hold elements in memory.
+        optimizations: The optimizations that apply to the stage.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        lazy: bool = True,
+        memory: str | None = None,
+        max_elements: int | None = None,
+        optimizations: Sequence[str] = (),
+    ):
+        self.name = name
+        self.lazy = lazy
+        self.memory = memory
+        self.max_elements = max_elements
+        self.optimizations = list(optimizations)
+
+    def __repr__(self) -> str:
+        description = f"{self.name}: {'lazy' if self.lazy else 'MATERIALIZES'}"
+
+        if self.memory is not None:
+            description += f", holds {self.memory}"
+            if self.max_elements is not None:
+                description += f" (reads at most {self.max_elements:,} elements)"
+
+        for optimization in self.optimizations:
+            description += f"; {optimization}"
+
+        return description
+
+
+class Plan:
+    """The plan of a pipeline, as described by `explain`.
+
+    Attributes:
+        stages: The stages of the pipeline, starting with its source.
+    """
+
+    def __init__(self, stages: Sequence[PlanStage]):
+        self.stages = list(stages)
+
+    @property
+    def materializes(self) -> bool:
+        """Whether any stage reads its entire source before producing elements."""
+        return not all(stage.lazy for stage in self.stages)
+
+    def __repr__(self) -> str:
+        return "\n".join(
+            f"{index}. {stage!r}" for index, stage in enumerate(self.stages, start=1)
+        )
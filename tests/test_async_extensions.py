@@ -0,0 +1,120 @@
+import asyncio
+
+import pytest
+
+from iterable_extensions.async_extensions import (
+    count,
+    first,
+    group_by,
+    select,
+    to_dictionary,
+    to_list,
+    where,
+)
+
+
+async def _generate(values):
+    for value in values:
+        await asyncio.sleep(0)
+        yield value
+
+
+def test_where():
+    # Assign
+    source = [1, 2, 3, 4, 5, 6, 7, 8]
+
+    async def predicate(x: int) -> bool:
+        await asyncio.sleep(0)
+        return x > 4
+
+    # Act
+    result = source | where[int](predicate)
+
+    # Assert
+    for _ in range(2):  # Test reusable iterable
+        assert asyncio.run(result | to_list()) == [5, 6, 7, 8]
+
+
+def test_select():
+    # Assign
+    source = _generate([1, 2, 3])
+
+    # Act
+    result = source | select[int, int](lambda x: 2 * x)
+
+    # Assert
+    assert asyncio.run(result | to_list()) == [2, 4, 6]
+
+
+def test_select_max_concurrency():
+    # Assign
+    running = []
+    peak = []
+
+    async def selector(x: int) -> int:
+        running.append(x)
+        peak.append(len(running))
+        await asyncio.sleep(0.01 * (5 - x))
+        running.remove(x)
+        return x
+
+    # Act
+    result = _generate(range(5)) | select[int, int](selector, max_concurrency=3)
+
+    # Assert
+    assert asyncio.run(result | to_list()) == [0, 1, 2, 3, 4]
+    assert max(peak) == 3
+
+
+def test_group_by():
+    # Assign
+    source = _generate([3, 1, 4, 1, 5, 9, 2, 6])
+
+    async def key_selector(x: int) -> int:
+        return x % 2
+
+    # Act
+    groups = source | group_by[int, int](key_selector, max_concurrency=4)
+
+    async def collect():
+        return [(g.key, list(g)) async for g in groups]
+
+    # Assert
+    assert asyncio.run(collect()) == [(1, [3, 1, 1, 5, 9]), (0, [4, 2, 6])]
+
+
+def test_count():
+    # Act
+    result = asyncio.run(_generate([1, 2, 3]) | count())
+
+    # Assert
+    assert result == 3
+
+
+def test_first():
+    # Act
+    result = asyncio.run(_generate([5, 8, 2]) | first())
+
+    # Assert
+    assert result == 5
+
+
+def test_first_valueerror():
+    # Act
+    with pytest.raises(ValueError):
+        asyncio.run(_generate([]) | first())
+
+
+def test_to_dictionary():
+    # Assign
+    async def value_selector(x: int) -> str:
+        return str(x)
+
+    # Act
+    result = asyncio.run(
+        _generate([1, 2, 3])
+        | to_dictionary[int, int, str](lambda x: 2 * x, value_selector)
+    )
+
+    # Assert
+    assert result == {2: "1", 4: "2", 6: "3"}
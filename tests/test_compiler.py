@@ -0,0 +1,120 @@
+import pytest
+
+from iterable_extensions.compiler import Pipeline, compile
+from iterable_extensions.expressions import F
+from iterable_extensions.iterable_extensions import (
+    any,
+    count,
+    first,
+    first_or_none,
+    last,
+    last_or_none,
+    max,
+    min,
+    order_by,
+    select,
+    to_dictionary,
+    to_list,
+    where,
+)
+
+
+def test_compile_lazy():
+    # Assign
+    source = [1, 2, 3, 4, 5]
+    plan = compile(where[int](lambda x: x > 1), select(F * 10), where(F != 30))
+
+    # Act
+    result = source | plan
+
+    # Assert
+    for _ in range(2):  # Test reusable iterable
+        assert result | to_list() == [20, 40, 50]
+
+
+def test_compile_reusable_on_new_sources():
+    # Assign
+    plan = compile(where(F % 2 == 0), select[int, str](str), to_list())
+
+    # Act
+    first_result = range(5) | plan
+    second_result = (x for x in [6, 7, 8]) | plan
+
+    # Assert
+    assert first_result == ["0", "2", "4"]
+    assert second_result == ["6", "8"]
+
+
+@pytest.mark.parametrize(
+    "terminal, expected, expected_empty",
+    [
+        (count(), 3, 0),
+        (first(), 20, ValueError),
+        (first_or_none(), 20, None),
+        (last(), 40, ValueError),
+        (last_or_none(), 40, None),
+        (min(), 20, ValueError),
+        (max(), 40, ValueError),
+        (any(), True, False),
+        (any[int](lambda x: x == 30), True, False),
+        (to_dictionary(F // 10, F + 1), {2: 21, 3: 31, 4: 41}, {}),
+    ],
+)
+def test_compile_terminal(terminal, expected, expected_empty):
+    # Assign
+    plan = compile(where(F > 1), select(F * 10), terminal)
+
+    # Act
+    result = [1, 2, 3, 4] | plan
+
+    # Assert
+    assert result == expected
+
+    if expected_empty is ValueError:
+        with pytest.raises(ValueError):
+            [1] | plan  # pyright: ignore[reportUnusedExpression]
+    else:
+        assert [1] | plan == expected_empty
+
+
+def test_compile_with_other_extensions():
+    # Assign
+    source = [3, 1, 4, 1, 5, 9, 2, 6]
+    plan = compile(
+        where(F > 1),
+        order_by[int, int](lambda x: -x),
+        select(F * 2),
+        first(),
+    )
+
+    # Act
+    result = source | plan
+
+    # Assert
+    assert result == 18
+
+
+def test_pipeline():
+    # Assign
+    pipeline = Pipeline() | where(F % 2 == 0) | select[int, str](str)
+
+    # Act
+    result = range(5) | pipeline
+
+    # Assert
+    for _ in range(2):  # Test reusable iterable
+        assert result | to_list() == ["0", "2", "4"]
+
+
+def test_pipeline_is_extended_without_modifying():
+    # Assign
+    pipeline = Pipeline(where(F > 1))
+
+    # Act
+    counted = pipeline | count()
+    combined = pipeline | Pipeline(select(F * 2), to_list())
+
+    # Assert
+    assert [1, 2, 3] | counted == 2
+    assert [1, 2, 3] | combined == [4, 6]
+    assert [1, 2, 3] | pipeline | to_list() == [2, 3]
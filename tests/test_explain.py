@@ -0,0 +1,88 @@
+from iterable_extensions.expressions import F
+from iterable_extensions.iterable_extensions import (
+    chunk,
+    explain,
+    group_by,
+    order_by,
+    select,
+    take,
+    to_list,
+    where,
+)
+
+
+def test_explain_stages():
+    # Assign
+    source = [3, 1, 4, 1, 5]
+    pipeline = source | where(F > 1) | select(F * 2) | group_by(F % 3) | chunk(2)
+
+    # Act
+    plan = pipeline | explain()
+
+    # Assert
+    assert [stage.name for stage in plan.stages] == [
+        "list of 5 elements",
+        "where | select",
+        "group_by",
+        "chunk",
+    ]
+    assert plan.materializes
+
+    fused, grouped, chunked = plan.stages[1:]
+    assert fused.lazy and fused.memory is None
+    assert "2 stages fused into one loop" in fused.optimizations
+    assert not grouped.lazy
+    assert grouped.memory == "all elements"
+    assert grouped.max_elements == 5
+    assert chunked.lazy
+    assert chunked.memory == "one chunk of 2 elements"
+
+
+def test_explain_does_not_iterate():
+    # Assign
+    consumed = []
+
+    def source():
+        for x in range(3):
+            consumed.append(x)
+            yield x
+
+    pipeline = source() | where[int](lambda x: x > 0)
+
+    # Act
+    plan = pipeline | explain()
+
+    # Assert
+    assert consumed == []
+    assert plan.stages[0].name == "one-shot iterator"
+    assert not plan.materializes
+    assert pipeline | to_list() == [1, 2]
+
+
+def test_explain_order_by_take():
+    # Assign
+    pipeline = range(10) | order_by(-F) | take(3)
+
+    # Act
+    plan = pipeline | explain()
+
+    # Assert
+    source, ordered, taken = plan.stages
+    assert source.name == "range of 10 elements"
+    assert ordered.lazy
+    assert ordered.memory is None
+    assert not taken.lazy
+    assert taken.memory == "3 elements"
+    assert taken.max_elements == 10
+    assert plan.materializes
+    assert "3. take: MATERIALIZES, holds 3 elements" in repr(plan)
+
+
+def test_explain_plain_iterable():
+    # Act
+    plan = [1, 2, 3] | explain()
+
+    # Assert
+    (stage,) = plan.stages
+    assert stage.name == "list of 3 elements"
+    assert not plan.materializes
@@ -0,0 +1,154 @@
+import operator
+import pickle
+from dataclasses import dataclass
+
+import pytest
+
+from iterable_extensions.expressions import F, as_callable, is_vectorizable, structure
+from iterable_extensions.iterable_extensions import (
+    any,
+    group_by,
+    order_by,
+    select,
+    to_dictionary,
+    to_list,
+    where,
+)
+
+
+@dataclass
+class Person:
+    age: int
+    name: str
+
+
+def test_where_select_expressions():
+    # Assign
+    source = [
+        Person(31, "Arthur"),
+        Person(12, "Becky"),
+        Person(45, "Chris"),
+    ]
+
+    # Act
+    result = source | where(F.age > 30) | select(F.name.upper.call())
+
+    # Assert
+    for _ in range(2):  # Test reusable iterable
+        assert result | to_list() == ["ARTHUR", "CHRIS"]
+
+
+def test_expression_operators():
+    # Assign
+    source = [{"value": x} for x in range(10)]
+
+    # Act
+    result = (
+        source
+        | where((F["value"] % 2 == 0) & ~(F["value"] == 4) | (F["value"] == 9))
+        | select(100 - F["value"] * 10)
+    )
+
+    # Assert
+    assert result | to_list() == [100, 80, 40, 20, 10]
+
+
+def test_expression_method_call_with_arguments():
+    # Assign
+    source = ["a-b", "c-d-e"]
+
+    # Act
+    result = source | select(F.split.call("-", maxsplit=1))
+
+    # Assert
+    assert result | to_list() == [["a", "b"], ["c", "d-e"]]
+
+
+def test_expression_as_plain_callable():
+    # Assign
+    source = [
+        Person(31, "Arthur"),
+        Person(0, "Becky"),
+        Person(45, "Chris"),
+    ]
+
+    # Act
+    ages = list(map(F.age, source))
+    ordered = sorted(source, key=F.age)
+    filtered = list(filter(F.age, source))
+
+    # Assert
+    assert ages == [31, 0, 45]
+    assert [p.name for p in ordered] == ["Becky", "Arthur", "Chris"]
+    assert [p.name for p in filtered] == ["Arthur", "Chris"]
+
+
+def test_expression_key_selectors():
+    # Assign
+    source = [
+        Person(31, "Arthur"),
+        Person(12, "Becky"),
+        Person(31, "Chris"),
+    ]
+
+    # Act
+    ordered = source | order_by(F.age) | select(F.name) | to_list()
+    grouped = source | group_by(F.age) | select(F.key) | to_list()
+    dictionary = source | to_dictionary(F.name, F.age)
+    contains = source | any(F.name == "Becky")
+
+    # Assert
+    assert ordered == ["Becky", "Arthur", "Chris"]
+    assert grouped == [31, 12]
+    assert dictionary == {"Arthur": 31, "Becky": 12, "Chris": 31}
+    assert contains is True
+
+
+def test_expression_compiles_to_accessor():
+    # Assign
+    source = Person(31, "Arthur")
+
+    # Act
+    attribute = as_callable(F.name)
+    item = as_callable(F[0])
+
+    # Assert
+    assert isinstance(attribute, operator.attrgetter)
+    assert isinstance(item, operator.itemgetter)
+    assert attribute(source) == "Arthur"
+
+
+def test_expression_structure():
+    # Act
+    result = structure(F.age > 30)
+
+    # Assert
+    assert result == (
+        "binary",
+        "gt",
+        ("attribute", ("element",), "age"),
+        ("constant", 30),
+    )
+    assert repr((F.age > 30) & ~F.active) == "((F.age > 30) & (~F.active))"
+    assert is_vectorizable((F > 3) & (F % 2 == 0))
+    assert not is_vectorizable(F.age > 30)
+    assert not is_vectorizable(F & 1)
+    assert not is_vectorizable(~F)
+
+
+def test_expression_pickle():
+    # Assign
+    expression = F.name.upper.call()
+    expression(Person(31, "Arthur"))
+
+    # Act
+    result = pickle.loads(pickle.dumps(expression))
+
+    # Assert
+    assert result(Person(12, "Becky")) == "BECKY"
+
+
+def test_expression_no_truth_value():
+    # Act
+    with pytest.raises(TypeError):
+        bool(F.age > 30)
@@ -1,7 +1,16 @@
+import array
+import multiprocessing
+import operator
+import threading
+import warnings
+from typing import cast
+
 import pytest
 
 from iterable_extensions.iterable_extensions import (
     any,
+    cache,
+    chunk,
     count,
     distinct,
     first,
@@ -13,9 +22,14 @@ from iterable_extensions.iterable_extensions import (
     min,
     order_by,
     order_by_descending,
+    parallel_select,
+    replay,
     select,
+    select_batch,
     single,
     single_or_none,
+    take,
+    threaded_select,
     to_dictionary,
     to_list,
     where,
@@ -46,6 +60,39 @@ def test_select():
         assert list(result) == [(1, 2), (2, 4), (3, 6)]
 
 
+def test_where_select_chain():
+    # Assign
+    source = [1, 2, 3, 4, 5, 6, 7, 8]
+
+    # Act
+    result = (
+        source
+        | where[int](lambda x: x % 2 == 0)
+        | select[int, int](lambda x: 10 * x)
+        | where[int](lambda x: x > 20)
+        | select[int, str](lambda x: str(x))
+    )
+
+    # Assert
+    for _ in range(2):  # Test reusable iterable
+        assert list(result) == ["40", "60", "80"]
+
+
+def test_where_select_chain_branches_independently():
+    # Assign
+    source = [1, 2, 3, 4]
+    base = source | where[int](lambda x: x > 1)
+
+    # Act
+    doubled = base | select[int, int](lambda x: 2 * x)
+    filtered = base | where[int](lambda x: x < 4)
+
+    # Assert
+    assert list(base) == [2, 3, 4]
+    assert list(doubled) == [4, 6, 8]
+    assert list(filtered) == [2, 3]
+
+
 def test_to_list():
     # Assign
     source = (x for x in [1, 2, 3])
@@ -364,6 +411,36 @@ def test_distinct():
         assert list(result) == [1, 3, 4, 7, 9]
 
 
+@pytest.mark.parametrize("max_elements", [1, 2, 10])
+def test_distinct_max_elements(max_elements):
+    # Assign
+    source = (x for x in [1, 3, 4, 1, 3, 7, 9, 3, 7, 2, 1, 8]) | replay[int]()
+
+    # Act
+    result = source | distinct[int](max_elements=max_elements, compress=True)
+
+    # Assert
+    for _ in range(2):  # Test reusable iterable
+        assert list(result) == [1, 3, 4, 7, 9, 2, 8]
+
+
+def test_distinct_max_elements_unordered():
+    # Assign
+    source = [1, 3, 4, 1, 3, 7, 9, 3, 7, 2, 1, 8]
+
+    # Act
+    result = source | distinct[int](max_elements=2, ordered=False)
+
+    # Assert
+    assert sorted(result) == [1, 2, 3, 4, 7, 8, 9]
+
+
+def test_distinct_max_elements_valueerror():
+    # Act & Assert
+    with pytest.raises(ValueError):
+        distinct[int](max_elements=0)
+
+
 def test_last():
     # Assign
     source = [5, 8, 2]
@@ -404,3 +481,886 @@ def test_last_or_none_returns_none():
 
     # Assert
     assert result is None
+
+
+def test_take():
+    # Assign
+    source = [4, 7, 2, 9]
+
+    # Act
+    result = source | take[int](2)
+
+    # Assert
+    for _ in range(2):  # Test reusable iterable
+        assert list(result) == [4, 7]
+
+
+def test_take_more_than_available():
+    # Assign
+    source = [4, 7]
+
+    # Act
+    result = source | take[int](5)
+
+    # Assert
+    assert list(result) == [4, 7]
+
+
+def test_order_by_take():
+    # Assign
+    source = [(3, "a"), (1, "b"), (2, "c"), (1, "d"), (5, "e")]
+
+    # Act
+    result = source | order_by[tuple[int, str], int](lambda x: x[0]) | take(3)
+
+    # Assert
+    for _ in range(2):  # Test reusable iterable
+        assert list(result) == [(1, "b"), (1, "d"), (2, "c")]
+
+
+def test_order_by_descending_take():
+    # Assign
+    source = [(3, "a"), (5, "b"), (2, "c"), (5, "d"), (1, "e")]
+
+    # Act
+    result = (
+        source | order_by_descending[tuple[int, str], int](lambda x: x[0]) | take(3)
+    )
+
+    # Assert
+    assert list(result) == [(5, "b"), (5, "d"), (3, "a")]
+
+
+def test_order_by_first():
+    # Assign
+    source = [(3, "a"), (1, "b"), (1, "c")]
+
+    # Act
+    result = source | order_by[tuple[int, str], int](lambda x: x[0]) | first()
+
+    # Assert
+    assert result == (1, "b")
+
+
+def test_order_by_descending_first():
+    # Assign
+    source = [(3, "a"), (5, "b"), (5, "c")]
+
+    # Act
+    result = (
+        source | order_by_descending[tuple[int, str], int](lambda x: x[0]) | first()
+    )
+
+    # Assert
+    assert result == (5, "b")
+
+
+def test_order_by_first_valueerror():
+    # Assign
+    source = []
+
+    # Act
+    with pytest.raises(ValueError):
+        source | order_by[int, int](lambda x: x) | first()  # pyright: ignore[reportUnusedExpression]
+
+
+def test_order_by_first_or_none_empty_iterable():
+    # Assign
+    source = []
+
+    # Act
+    result = source | order_by[int, int](lambda x: x) | first_or_none()
+
+    # Assert
+    assert result is None
+
+
+def test_order_by_lazy():
+    # Assign
+    source = [(3, "a"), (1, "b"), (2, "c"), (1, "d"), (5, "e")]
+
+    # Act
+    result = source | order_by[tuple[int, str], int](lambda x: x[0], lazy=True)
+
+    # Assert
+    for _ in range(2):  # Test reusable iterable
+        assert list(result) == [(1, "b"), (1, "d"), (2, "c"), (3, "a"), (5, "e")]
+
+
+def test_order_by_descending_lazy():
+    # Assign
+    source = [(3, "a"), (5, "b"), (2, "c"), (5, "d"), (1, "e")]
+
+    # Act
+    result = source | order_by_descending[tuple[int, str], int](
+        lambda x: x[0], lazy=True
+    )
+
+    # Assert
+    for _ in range(2):  # Test reusable iterable
+        assert list(result) == [(5, "b"), (5, "d"), (3, "a"), (2, "c"), (1, "e")]
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_order_by_sorts_once(lazy):
+    # Assign
+    source = [3, 5, 1, 2, 4]
+    calls = []
+
+    def key_selector(x: int) -> int:
+        calls.append(x)
+        return x
+
+    # Act
+    result = source | order_by[int, int](key_selector, lazy=lazy)
+
+    # Assert
+    for _ in range(2):  # Test reusable iterable
+        assert list(result) == [1, 2, 3, 4, 5]
+        assert result | take(2) | to_list() == [1, 2]
+        assert len(calls) == 5
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_order_by_generator_source_reused(lazy):
+    # Assign
+    source = (x for x in [3, 5, 1, 2, 4])
+
+    # Act
+    result = source | order_by[int, int](lambda x: x, lazy=lazy)
+
+    # Assert
+    for _ in range(2):  # Test reusable iterable
+        assert list(result) == [1, 2, 3, 4, 5]
+        assert result | first() == 1
+
+
+@pytest.mark.parametrize("run_size", [1, 2, 5, 7])
+@pytest.mark.parametrize("compress", [False, True])
+def test_order_by_run_size(run_size, compress):
+    # Assign
+    source = [(3, "a"), (1, "b"), (2, "c"), (1, "d"), (5, "e"), (2, "f")]
+
+    # Act
+    result = source | order_by[tuple[int, str], int](
+        lambda x: x[0], run_size=run_size, compress=compress
+    )
+
+    # Assert
+    for _ in range(2):  # Test reusable iterable
+        assert list(result) == sorted(source, key=lambda x: x[0])
+
+
+def test_order_by_descending_run_size():
+    # Assign
+    source = (x for x in [(3, "a"), (5, "b"), (2, "c"), (5, "d"), (1, "e")]) | replay[
+        tuple[int, str]
+    ]()
+
+    # Act
+    result = source | order_by_descending[tuple[int, str], int](
+        lambda x: x[0], run_size=2
+    )
+
+    # Assert
+    for _ in range(2):  # Test reusable iterable
+        assert list(result) == [(5, "b"), (5, "d"), (3, "a"), (2, "c"), (1, "e")]
+
+
+def test_order_by_run_size_valueerror():
+    # Act & Assert
+    with pytest.raises(ValueError):
+        order_by[int, int](lambda x: x, run_size=0)
+    with pytest.raises(ValueError):
+        order_by_descending[int, int](lambda x: x, lazy=True, run_size=10)
+
+
+def test_group_by_first_seen_order():
+    # Assign
+    source = [3, 1, 4, 1, 5, 9, 2, 6, 5, 3]
+
+    # Act
+    groups = source | group_by[int, int](lambda x: x % 3)
+
+    # Assert
+    for _ in range(2):  # Test reusable iterable
+        assert [(g.key, list(g)) for g in groups] == [
+            (0, [3, 9, 6, 3]),
+            (1, [1, 4, 1]),
+            (2, [5, 2, 5]),
+        ]
+
+
+def test_group_by_unorderable_keys():
+    # Assign
+    source = [1, "a", 2, "b", None]
+
+    # Act
+    groups = source | group_by[object, type](lambda x: type(x))
+
+    # Assert
+    assert [(g.key, list(g)) for g in groups] == [
+        (int, [1, 2]),
+        (str, ["a", "b"]),
+        (type(None), [None]),
+    ]
+
+
+def test_group_by_sort_strategy():
+    # Assign
+    source = [3, 1, 4, 1, 5, 9, 2, 6, 5, 3]
+
+    # Act
+    groups = source | group_by[int, int](lambda x: -(x % 3), strategy="sort")
+
+    # Assert
+    for _ in range(2):  # Test reusable iterable
+        assert [(g.key, list(g)) for g in groups] == [
+            (-2, [5, 2, 5]),
+            (-1, [1, 4, 1]),
+            (0, [3, 9, 6, 3]),
+        ]
+
+
+@pytest.mark.parametrize("strategy", ["hash", "sort"])
+@pytest.mark.parametrize("max_elements", [1, 3, 100])
+def test_group_by_max_elements(strategy, max_elements):
+    # Assign
+    source = (x for x in [3, 1, 4, 1, 5, 9, 2, 6, 5, 3]) | replay[int]()
+    calls = []
+
+    def key_selector(x: int) -> int:
+        calls.append(x)
+        return x % 3
+
+    # Act
+    groups = source | group_by[int, int](
+        key_selector, strategy=strategy, max_elements=max_elements, compress=True
+    )
+
+    # Assert
+    for _ in range(2):  # Test reusable iterable
+        assert sorted((g.key, list(g)) for g in groups) == [
+            (0, [3, 9, 6, 3]),
+            (1, [1, 4, 1]),
+            (2, [5, 2, 5]),
+        ]
+    assert len(calls) == 20
+
+
+def test_group_by_max_elements_valueerror():
+    # Act & Assert
+    with pytest.raises(ValueError):
+        group_by[int, int](lambda x: x, max_elements=0)
+
+
+def test_group_by_unknown_strategy():
+    # Act
+    with pytest.raises(ValueError):
+        group_by[int, int](lambda x: x, strategy="unknown")  # pyright: ignore[reportArgumentType]
+
+
+@pytest.mark.parametrize("strategy", ["hash", "sort"])
+def test_group_by_evaluates_key_selector_once(strategy):
+    # Assign
+    source = [3, 1, 4, 1, 5, 9, 2, 6]
+    calls = []
+
+    def key_selector(x: int) -> int:
+        calls.append(x)
+        return x % 2
+
+    # Act
+    groups = list(source | group_by[int, int](key_selector, strategy=strategy))
+
+    # Assert
+    assert len(calls) == len(source)
+    assert sorted((g.key, list(g)) for g in groups) == [
+        (0, [4, 2, 6]),
+        (1, [3, 1, 1, 5, 9]),
+    ]
+
+
+@pytest.mark.parametrize("lazy, run_size", [(False, None), (True, None), (False, 3)])
+def test_order_by_group_by_reuses_keys(lazy, run_size):
+    # Assign
+    source = (x for x in [3, 1, 4, 1, 5, 9, 2, 6])
+    calls = []
+
+    def key_selector(x: int) -> int:
+        calls.append(x)
+        return x % 3
+
+    # Act
+    groups = list(
+        source
+        | order_by_descending[int, int](key_selector, lazy=lazy, run_size=run_size)
+        | group_by[int, int](key_selector)
+    )
+
+    # Assert
+    assert len(calls) == 8
+    assert [(g.key, list(g)) for g in groups] == [
+        (2, [5, 2]),
+        (1, [1, 4, 1]),
+        (0, [3, 9, 6]),
+    ]
+
+
+@pytest.mark.parametrize(
+    "strategy, expected_keys", [("hash", [2, 1, 0]), ("sort", [0, 1, 2])]
+)
+def test_order_by_descending_group_by_strategy(strategy, expected_keys):
+    # Assign
+    source = [3, 1, 4, 1, 5, 9, 2, 6]
+
+    def key_selector(x: int) -> int:
+        return x % 3
+
+    # Act
+    groups = (
+        source
+        | order_by_descending[int, int](key_selector)
+        | group_by[int, int](key_selector, strategy=strategy)
+    )
+
+    # Assert
+    for _ in range(2):  # Test reusable iterable
+        assert [g.key for g in groups] == expected_keys
+
+
+def test_group_by_consecutive_strategy():
+    # Assign
+    source = [1, 1, 2, 2, 2, 1, 3]
+
+    # Act
+    groups = source | group_by[int, int](lambda x: x, strategy="consecutive")
+
+    # Assert
+    for _ in range(2):  # Test reusable iterable
+        assert [(g.key, list(g)) for g in groups] == [
+            (1, [1, 1]),
+            (2, [2, 2, 2]),
+            (1, [1]),
+            (3, [3]),
+        ]
+
+
+def test_group_by_consecutive_strategy_streams_groups():
+    # Assign
+    consumed = []
+
+    def source():
+        for x in [1, 1, 1, 2, 2]:
+            consumed.append(x)
+            yield x
+
+    # Act
+    groups = iter(source() | group_by[int, int](lambda x: x, strategy="consecutive"))
+    group = next(groups)
+    first_element = next(iter(group))
+
+    # Assert
+    assert group.key == 1
+    assert first_element == 1
+    assert consumed == [1]
+
+
+def test_count_sized_select_does_not_iterate():
+    # Assign
+    calls = []
+    source = range(10) | select[int, int](lambda x: calls.append(x) or x)
+
+    # Act
+    result = source | count()
+
+    # Assert
+    assert result == 10
+    assert calls == []
+
+
+def test_count_generator():
+    # Assign
+    source = (x for x in range(7))
+
+    # Act
+    result = source | count()
+
+    # Assert
+    assert result == 7
+
+
+def test_last_select_evaluates_last_element_only():
+    # Assign
+    calls = []
+    source = [1, 2, 3] | select[int, int](lambda x: calls.append(x) or 10 * x)
+
+    # Act
+    result = source | last()
+
+    # Assert
+    assert result == 30
+    assert calls == [3]
+
+
+def test_last_dict_view():
+    # Assign
+    source = {"a": 1, "b": 2}
+
+    # Act
+    result = source.values() | last()
+
+    # Assert
+    assert result == 2
+
+
+def test_last_where_iterates():
+    # Assign
+    source = [1, 2, 3, 4] | where[int](lambda x: x < 3)
+
+    # Act
+    result = source | last_or_none()
+
+    # Assert
+    assert result == 2
+
+
+def test_single_sized_more_than_one_element():
+    # Assign
+    source = range(1_000_000_000)
+
+    # Act
+    with pytest.raises(ValueError):
+        source | single()  # pyright: ignore[reportUnusedExpression]
+
+
+def test_length_hint_select():
+    # Assign
+    source = (
+        [1, 2, 3] | select[int, int](lambda x: 2 * x) | order_by[int, int](lambda x: -x)
+    )
+
+    # Act
+    result = operator.length_hint(source)
+
+    # Assert
+    assert result == 3
+
+
+def test_length_hint_where():
+    # Assign
+    source = [1, 2, 3] | where[int](lambda x: x > 1)
+
+    # Act
+    result = operator.length_hint(source, -1)
+
+    # Assert
+    assert result == -1
+
+
+def test_cache():
+    # Assign
+    calls = []
+    source = [1, 2, 3] | select[int, int](lambda x: calls.append(x) or 2 * x)
+
+    # Act
+    result = source | cache[int]()
+
+    # Assert
+    for _ in range(3):  # Test reusable iterable
+        assert list(result) == [2, 4, 6]
+    assert calls == [1, 2, 3]
+
+
+def test_cache_concurrent_iterators():
+    # Assign
+    calls = []
+    source = [1, 2, 3] | select[int, int](lambda x: calls.append(x) or x)
+    cached = source | cache[int]()
+
+    # Act
+    iterator1 = iter(cached)
+    iterator2 = iter(cached)
+    result = [next(iterator1), next(iterator2), next(iterator2), next(iterator1)]
+    rest1, rest2 = list(iterator1), list(iterator2)
+
+    # Assert
+    assert result == [1, 1, 2, 2]
+    assert rest1 == [3]
+    assert rest2 == [3]
+    assert calls == [1, 2, 3]
+
+
+def test_cache_bounded_read_ahead():
+    # Assign
+    calls = []
+    source = range(1000) | select[int, int](lambda x: calls.append(x) or x)
+    cached = source | cache[int]()
+
+    # Act
+    iterator = iter(cached)
+    head = [next(iterator) for _ in range(400)]
+
+    # Assert
+    assert head == list(range(400))
+    assert len(calls) <= 400 + 400 // 8 + 1
+    assert list(cached) == list(range(1000))
+    assert len(calls) == 1000
+
+
+def test_cache_max_elements_exceeded():
+    # Assign
+    calls = []
+    source = [1, 2, 3, 4] | select[int, int](lambda x: calls.append(x) or x)
+    cached = source | cache[int](max_elements=2)
+
+    # Act
+    iterator = iter(cached)
+    head = [next(iterator), next(iterator)]
+    behind = iter(cached)
+    next(behind)
+
+    # Assert
+    assert head + list(iterator) == [1, 2, 3, 4]
+    assert list(behind) == [2, 3, 4]
+    assert list(cached) == [1, 2, 3, 4]
+    assert calls == [1, 2, 3, 4, 1, 2, 3, 4, 1, 2, 3, 4]
+
+
+def test_cache_reset_after_exception():
+    # Assign
+    fail = [True]
+
+    def selector(x: int) -> int:
+        if x == 2 and fail[0]:
+            raise RuntimeError()
+        return x
+
+    cached = [1, 2, 3] | select[int, int](selector) | cache[int]()
+
+    # Act
+    with pytest.raises(RuntimeError):
+        list(cached)
+    fail[0] = False
+
+    # Assert
+    assert list(cached) == [1, 2, 3]
+
+
+def test_where_generator_source():
+    # Assign
+    source = (x for x in [1, 2, 3, 4, 5, 6, 7, 8])
+
+    # Act
+    result = source | where[int](lambda x: x > 4)
+
+    # Assert
+    assert list(result) == [5, 6, 7, 8]
+    with pytest.raises(RuntimeError):
+        list(result)
+
+
+def test_select_generator_source_partially_consumed():
+    # Assign
+    source = (x for x in [1, 2, 3])
+    result = source | select[int, int](lambda x: 2 * x)
+
+    # Act
+    head = result | first()
+    rest = result | to_list()
+
+    # Assert
+    assert head == 2
+    assert rest == [4, 6]
+    with pytest.raises(RuntimeError):
+        result | to_list()  # pyright: ignore[reportUnusedExpression]
+
+
+def test_where_generator_source_writes_nothing_to_disk(monkeypatch):
+    # Assign
+    def no_temporary_file(*args, **kwargs):
+        raise AssertionError("Temporary file created")
+
+    monkeypatch.setattr("tempfile.TemporaryFile", no_temporary_file)
+    source = (x for x in range(300_000))
+
+    # Act
+    result = source | where[int](lambda x: x % 10 != 0) | to_list()
+
+    # Assert
+    assert len(result) == 270_000
+
+
+def test_replay():
+    # Assign
+    source = (x for x in [1, 2, 3, 4, 5, 6, 7, 8])
+
+    # Act
+    result = source | replay[int]() | where[int](lambda x: x > 4)
+
+    # Assert
+    for _ in range(2):  # Test reusable iterable
+        assert list(result) == [5, 6, 7, 8]
+
+
+def test_replay_after_stage():
+    # Assign
+    calls = []
+    source = (x for x in [1, 2, 3, 4, 5, 6, 7, 8])
+
+    # Act
+    result = (
+        source
+        | where[int](lambda x: calls.append(x) or x > 4)
+        | replay[int]()
+        | select[int, int](lambda x: 2 * x)
+    )
+
+    # Assert
+    for _ in range(2):  # Test reusable iterable
+        assert list(result) == [10, 12, 14, 16]
+    assert calls == [1, 2, 3, 4, 5, 6, 7, 8]
+
+
+def test_replay_max_elements_discards_buffer():
+    # Assign
+    source = (x for x in range(10))
+    replayed = source | replay[int](max_elements=4)
+
+    # Act
+    result = list(replayed)
+
+    # Assert
+    assert result == list(range(10))
+    with pytest.raises(RuntimeError):
+        list(replayed)
+
+
+def test_replay_spill():
+    # Assign
+    source = (x for x in range(5_000))
+
+    # Act
+    replayed = source | replay[int](max_elements=1_000, spill=True, compress=True)
+
+    # Assert
+    for _ in range(2):  # Test reusable iterable
+        assert list(replayed) == list(range(5_000))
+
+
+def test_replay_spill_unpicklable():
+    # Assign
+    source = (threading.Lock() for _ in range(5_000))
+    replayed = source | replay[threading.Lock](max_elements=1_000, spill=True)
+
+    # Act & Assert
+    with pytest.raises(TypeError):
+        list(replayed)
+    with pytest.raises(RuntimeError):
+        list(replayed)
+
+
+def test_replay_reusable_source():
+    # Assign
+    source = [1, 2, 3]
+
+    # Act
+    result = source | replay[int]()
+
+    # Assert
+    assert result is source
+
+
+def test_replay_valueerror():
+    # Act & Assert
+    with pytest.raises(ValueError):
+        replay[int](max_elements=0)
+    with pytest.raises(ValueError):
+        replay[int](spill=True)
+
+
+def test_order_by_generator_source():
+    # Assign
+    source = (x for x in [3, 5, 1, 2, 4]) | replay[int]()
+
+    # Act
+    result = source | order_by[int, int](lambda x: x)
+
+    # Assert
+    assert list(result | take(2)) == [1, 2]
+    assert list(result) == [1, 2, 3, 4, 5]
+
+
+def test_parallel_select():
+    # Assign
+    source = range(-50, 50)
+
+    # Act
+    result = source | parallel_select[int, int](
+        operator.neg, max_workers=2, chunk_size=7, max_in_flight=2
+    )
+
+    # Assert
+    for _ in range(2):  # Test reusable iterable
+        assert list(result) == [-x for x in source]
+
+
+def test_parallel_select_unordered():
+    # Assign
+    source = range(-50, 50)
+
+    # Act
+    result = source | parallel_select[int, int](
+        operator.neg, max_workers=2, chunk_size=7, ordered=False
+    )
+
+    # Assert
+    assert sorted(result) == sorted(-x for x in source)
+
+
+def test_parallel_select_mp_context():
+    # Assign
+    source = range(-50, 50)
+    # A running thread makes starting workers with fork() emit a DeprecationWarning
+    stop = threading.Event()
+    thread = threading.Thread(target=stop.wait)
+    thread.start()
+
+    # Act
+    try:
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+
+            default = source | parallel_select[int, int](operator.neg, max_workers=2)
+            spawned = source | parallel_select[int, int](
+                operator.neg,
+                max_workers=2,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+            results = [list(default), list(spawned)]
+    finally:
+        stop.set()
+        thread.join()
+
+    # Assert
+    assert results == [[-x for x in source]] * 2
+    assert not [x for x in caught if issubclass(x.category, DeprecationWarning)]
+
+
+def test_threaded_select():
+    # Assign
+    source = list(range(20))
+
+    # Act
+    result = source | threaded_select[int, int](lambda x: 2 * x, max_workers=4)
+
+    # Assert
+    for _ in range(2):  # Test reusable iterable
+        assert list(result) == [2 * x for x in source]
+
+
+def test_threaded_select_runs_concurrently():
+    # Assign
+    barrier = threading.Barrier(4, timeout=5)
+
+    def selector(x: int) -> int:
+        barrier.wait()  # Only passes when 4 calls are running at the same time
+        return x
+
+    # Act
+    result = list(
+        range(8) | threaded_select[int, int](selector, max_workers=4, ordered=False)
+    )
+
+    # Assert
+    assert sorted(result) == list(range(8))
+
+
+def test_threaded_select_bounded_read_ahead():
+    # Assign
+    consumed = []
+
+    def source():
+        for x in range(100):
+            consumed.append(x)
+            yield x
+
+    # Act
+    iterator = iter(
+        source()
+        | threaded_select[int, int](lambda x: x, max_workers=2, max_in_flight=3)
+    )
+    first_element = next(iterator)
+
+    # Assert
+    assert first_element == 0
+    assert len(consumed) <= 4
+
+
+def test_chunk():
+    # Assign
+    source = range(7)
+
+    # Act
+    result = source | chunk[int](3)
+
+    # Assert
+    for _ in range(2):  # Test reusable iterable
+        assert list(result) == [(0, 1, 2), (3, 4, 5), (6,)]
+
+
+def test_chunk_list():
+    # Assign
+    source = range(4)
+
+    # Act
+    result = source | chunk[int](2, kind="list")
+
+    # Assert
+    assert list(result) == [[0, 1], [2, 3]]
+
+
+def test_chunk_array():
+    # Assign
+    source = [1, 2, 3]
+
+    # Act
+    result = list(source | chunk[int](2, kind="array", typecode="q"))
+
+    # Assert
+    assert all(isinstance(c, array.array) for c in result)
+    assert [cast(array.array, c).typecode for c in result] == ["q", "q"]
+    assert [cast(array.array, c).tolist() for c in result] == [[1, 2], [3]]
+
+
+def test_chunk_valueerror():
+    # Act
+    with pytest.raises(ValueError):
+        chunk[int](0)
+
+
+@pytest.mark.parametrize("prefetch", [0, 2])
+def test_select_batch(prefetch):
+    # Assign
+    batches = []
+
+    def selector(batch: list[int]) -> list[str]:
+        batches.append(batch)
+        return [str(x) for x in batch]
+
+    # Act
+    result = range(7) | select_batch[int, str](selector, 3, prefetch=prefetch)
+
+    # Assert
+    assert list(result) == ["0", "1", "2", "3", "4", "5", "6"]
+    assert batches == [[0, 1, 2], [3, 4, 5], [6]]
+
+
+def test_select_batch_wrong_number_of_results():
+    # Assign
+    result = range(4) | select_batch[int, int](lambda batch: batch[:1], 2)
+
+    # Act
+    with pytest.raises(ValueError):
+        list(result)
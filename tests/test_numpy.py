@@ -0,0 +1,147 @@
+import pytest
+
+from iterable_extensions.compiler import compile
+from iterable_extensions.expressions import F
+from iterable_extensions.iterable_extensions import (
+    count,
+    explain,
+    max,
+    min,
+    select,
+    to_list,
+    vectorized,
+    where,
+)
+
+np = pytest.importorskip("numpy")
+
+
+def test_where_select_vectorized():
+    # Assign
+    source = np.arange(10)
+    calls = []
+
+    def is_even(x):
+        calls.append(x)
+        return x % 2 == 0
+
+    # Act
+    result = source | where(vectorized(is_even)) | select(np.negative)
+
+    # Assert
+    for _ in range(2):  # Test reusable iterable
+        assert result | to_list() == [0, -2, -4, -6, -8]
+    assert len(calls) == 2  # Called once per iteration, on the entire array
+
+
+def test_where_partially_vectorized():
+    # Assign
+    source = np.arange(6)
+
+    # Act
+    result = source | select(np.negative) | where[int](lambda x: x < -3)
+
+    # Assert
+    assert result | to_list() == [-4, -5]
+
+
+def test_where_vectorized_invalid_mask_falls_back():
+    # Assign
+    source = np.arange(4)
+
+    # Act
+    result = source | where(vectorized(lambda x: 1))  # pyright: ignore[reportArgumentType]
+
+    # Assert
+    assert result | to_list() == [0, 1, 2, 3]
+
+
+def test_count_min_max_vectorized():
+    # Assign
+    source = np.array([5, 3, 8, 1])
+
+    # Act
+    filtered = source | where(vectorized(lambda x: x > 2))
+
+    # Assert
+    assert filtered | count() == 3
+    assert filtered | min() == 3
+    assert filtered | max() == 8
+
+
+@pytest.mark.parametrize(
+    "values", [[1.0, float("nan"), 3.0], [float("nan"), 1.0, 3.0], [3.0, 1.0]]
+)
+def test_min_max_vectorized_nan(values):
+    # Assign
+    source = np.array(values)
+
+    # Act
+    minimum = source | min()
+    maximum = source | max()
+
+    # Assert
+    assert [minimum, maximum] == pytest.approx(
+        [values | min(), values | max()], nan_ok=True
+    )
+
+
+def test_min_vectorized_empty():
+    # Assign
+    source = np.array([], dtype=int)
+
+    # Act
+    with pytest.raises(ValueError):
+        source | min()  # pyright: ignore[reportUnusedExpression]
+
+
+def test_where_select_expression_vectorized():
+    # Assign
+    source = np.arange(10)
+
+    # Act
+    result = source | where((F > 3) & (F % 2 == 0)) | select(F * 10)
+
+    # Assert
+    assert result | to_list() == [40, 60, 80]
+    assert result | count() == 3
+
+
+def test_compile_vectorized():
+    # Assign
+    source = np.arange(10)
+
+    # Act
+    result = source | compile(where(F > 5), select(F * 2), count())
+
+    # Assert
+    assert result == 4
+
+
+def test_explain_vectorized():
+    # Assign
+    source = np.arange(10)
+
+    # Act
+    plan = source | where(F > 3) | select[int, str](str) | explain()
+
+    # Assert
+    assert "1 of 2 stages vectorized with NumPy" in plan.stages[1].optimizations
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [F & 1, F | 1, ~F, (F > 2) & ~(F > 5), (F < 2) | (F == 7), ~((F > 2) & F)],
+)
+def test_select_logical_expression_list_and_array(expression):
+    # Assign
+    source = [0, 3, 6, 7]
+
+    # Act
+    from_list = source | select(expression) | to_list()
+    from_array = np.array(source) | select(expression) | to_list()
+    compiled = source | compile(select(expression), to_list())
+
+    # Assert
+    assert from_array == from_list
+    assert compiled == from_list
@@ -0,0 +1,148 @@
+import pytest
+
+from iterable_extensions.expressions import F
+from iterable_extensions.iterable_extensions import (
+    cache,
+    group_by,
+    order_by,
+    select,
+    take,
+    to_list,
+    where,
+)
+from iterable_extensions.profiling import profile
+
+
+def test_profile_stages():
+    # Assign
+    with profile() as report:
+        pipeline = (
+            range(100)
+            | where(F % 2 == 0)
+            | select[int, int](lambda x: x // 10)
+            | group_by[int, int](lambda x: x)
+        )
+
+    # Act
+    result = pipeline | to_list()
+
+    # Assert
+    assert len(result) == 10
+
+    (grouped,) = report.stages
+    assert grouped.name == "group_by"
+    assert grouped.elements_in == 50
+    assert grouped.elements_out == 10
+    assert grouped.iterations == 1
+    assert grouped.first_element_seconds is not None
+    assert 0 < grouped.callable_seconds <= grouped.self_seconds <= grouped.seconds
+
+    fused = grouped.source
+    assert fused is not None
+    assert fused.name == "where | select"
+    assert fused.elements_in == 100
+    assert fused.elements_out == 50
+    assert fused.source is None
+
+    filtered, selected = fused.stages
+    assert (filtered.name, filtered.elements_in, filtered.elements_out) == (
+        "where",
+        100,
+        50,
+    )
+    assert (selected.name, selected.elements_in, selected.elements_out) == (
+        "select",
+        50,
+        50,
+    )
+
+
+def test_profile_shortcut_attributed_to_next_stage():
+    # Assign
+    with profile() as report:
+        pipeline = range(10) | order_by[int, int](lambda x: -x) | take(3)
+
+    # Act
+    result = pipeline | to_list()
+
+    # Assert
+    assert result == [9, 8, 7]
+
+    (taken,) = report.stages
+    assert taken.name == "take"
+    assert taken.elements_in == 3
+    assert taken.elements_out == 3
+    assert taken.source is not None
+    assert taken.source.name == "order_by"
+    assert taken.source.elements_in == 10
+    assert taken.source.elements_out == 3
+
+
+@pytest.mark.parametrize("lazy, run_size", [(False, None), (True, None), (False, 4)])
+def test_profile_order_by_elements_in(lazy, run_size):
+    # Assign
+    with profile() as report:
+        pipeline = range(10) | order_by[int, int](
+            lambda x: -x, lazy=lazy, run_size=run_size
+        )
+
+    # Act
+    result = pipeline | to_list()
+
+    # Assert
+    assert result == list(range(9, -1, -1))
+
+    (ordered,) = report.stages
+    assert (ordered.elements_in, ordered.elements_out) == (10, 10)
+
+
+def test_profile_order_by_group_by_elements_in():
+    # Assign
+    key_selector = F % 3
+
+    with profile() as report:
+        pipeline = (
+            range(10)
+            | order_by[int, int](key_selector)
+            | group_by[int, int](key_selector)
+        )
+
+    # Act
+    result = pipeline | to_list()
+
+    # Assert
+    assert len(result) == 3
+
+    (grouped,) = report.stages
+    assert (grouped.elements_in, grouped.elements_out) == (10, 3)
+    assert grouped.source is not None
+    assert grouped.source.elements_in == 10
+
+
+def test_profile_cache_elements_in():
+    # Assign
+    with profile() as report:
+        pipeline = range(10) | cache[int]()
+
+    # Act
+    results = [pipeline | to_list() for _ in range(2)]
+
+    # Assert
+    assert results == [list(range(10))] * 2
+
+    (cached,) = report.stages
+    assert cached.iterations == 2
+    assert (cached.elements_in, cached.elements_out) == (10, 20)
+
+
+def test_profile_not_recording_outside_context():
+    # Assign
+    with profile() as report:
+        pass
+
+    # Act
+    result = range(5) | where(F > 2) | to_list()
+
+    # Assert
+    assert result == [3, 4]
+    assert report.stages == []
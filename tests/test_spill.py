@@ -0,0 +1,229 @@
+import threading
+
+import pytest
+
+from iterable_extensions._spill import (
+    ReplayBuffer,
+    SpillFile,
+    external_sorted,
+    hash_distinct,
+    hash_grouped,
+)
+
+
+def test_spill_file():
+    # Assign
+    spill = SpillFile[int](compress=True)
+
+    # Act
+    spill.append([1, 2, 3])
+    spill.append([4, 5])
+
+    # Assert
+    assert len(spill) == 2
+    assert spill.read(1) == [4, 5]
+    assert list(spill) == [1, 2, 3, 4, 5]
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+def test_external_sorted(reverse, monkeypatch):
+    # Assign
+    monkeypatch.setattr("iterable_extensions._spill.SPILL_CHUNK_SIZE", 2)
+    decorated = [(x % 5, x) for x in range(23)]
+    chunks = []
+    append = SpillFile.append
+
+    def _append(self, chunk):
+        chunks.append(chunk)
+        append(self, chunk)
+
+    monkeypatch.setattr(SpillFile, "append", _append)
+
+    # Act
+    result = list(external_sorted(decorated, reverse=reverse, run_size=4))
+
+    # Assert
+    assert result == sorted(decorated, key=lambda x: x[0], reverse=reverse)
+    # Five full runs are spilled in chunks of two, the last three pairs are kept
+    assert len(chunks) == 10
+    assert all(len(chunk) == 2 for chunk in chunks)
+
+
+def test_hash_grouped_repartitions_skewed_keys(monkeypatch):
+    # Assign
+    monkeypatch.setattr("iterable_extensions._spill.PARTITIONS", 2)
+    monkeypatch.setattr("iterable_extensions._spill.SPILL_CHUNK_SIZE", 3)
+    decorated = [(x % 4, x) for x in range(40)] + [(0, x) for x in range(40, 100)]
+    depths = []
+    grouped = hash_grouped
+    written = []
+    append = SpillFile.append
+
+    def _hash_grouped(decorated, max_elements, compress=False, depth=0):
+        depths.append(depth)
+        return grouped(decorated, max_elements, compress, depth)
+
+    def _append(self, chunk):
+        written.extend(chunk)
+        append(self, chunk)
+
+    monkeypatch.setattr("iterable_extensions._spill.hash_grouped", _hash_grouped)
+    monkeypatch.setattr(SpillFile, "append", _append)
+
+    # Act
+    result = dict(hash_grouped(decorated, max_elements=8))
+
+    # Assert
+    assert sorted(result) == [0, 1, 2, 3]
+    assert result[0] == [x for key, x in decorated if key == 0]
+    assert result[3] == list(range(3, 40, 4))
+    # Partitioned until the keys are split, after which the partition holding the large
+    # group is grouped in memory
+    assert depths == [1, 2, 2, 1, 4]
+    assert len(written) == 2 * len(decorated)
+
+
+def test_hash_grouped_single_key_is_not_spilled(monkeypatch):
+    # Assign
+    decorated = ((0, x) for x in range(100_000))
+    append = SpillFile.append
+    written = []
+
+    def _append(self, chunk):
+        written.extend(chunk)
+        append(self, chunk)
+
+    monkeypatch.setattr(SpillFile, "append", _append)
+
+    # Act
+    result = list(hash_grouped(decorated, max_elements=1000))
+
+    # Assert
+    assert result == [(0, list(range(100_000)))]
+    assert written == []
+
+
+@pytest.mark.parametrize("ordered", [False, True])
+def test_hash_distinct_streams_until_spilled(ordered, monkeypatch):
+    # Assign
+    monkeypatch.setattr("iterable_extensions._spill.PARTITIONS", 2)
+    consumed = []
+
+    def indexed():
+        for index, element in enumerate([5, 1, 5, 2, 3, 1, 4, 2, 6, 3]):
+            consumed.append(element)
+            yield index, element
+
+    # Act
+    result = hash_distinct(indexed(), max_elements=3, ordered=ordered)
+    streamed = [next(result) for _ in range(3)]
+    consumed_while_streaming = list(consumed)
+    remaining = list(result)
+
+    # Assert
+    assert streamed == [(0, 5), (1, 1), (3, 2)]
+    assert consumed_while_streaming == [5, 1, 5, 2]
+    if ordered:
+        assert remaining == [(4, 3), (6, 4), (8, 6)]
+    else:
+        assert sorted(remaining) == [(4, 3), (6, 4), (8, 6)]
+
+
+def test_replay_buffer_spills_to_disk():
+    # Assign
+    source = iter(range(25))
+
+    # Act
+    buffer = ReplayBuffer(source, max_elements=8, spill=True, chunk_size=4)
+
+    # Assert
+    for _ in range(2):  # Test reusable iterable
+        assert list(buffer) == list(range(25))
+    assert buffer._file is not None
+    assert len(buffer._file) == 4
+
+
+def test_replay_buffer_concurrent_iterators():
+    # Assign
+    buffer = ReplayBuffer(iter(range(10)), max_elements=3, spill=True, chunk_size=3)
+
+    # Act
+    iterator1 = iter(buffer)
+    iterator2 = iter(buffer)
+    head = [next(iterator1) for _ in range(7)]
+    rest2 = list(iterator2)
+    rest1 = list(iterator1)
+
+    # Assert
+    assert head + rest1 == list(range(10))
+    assert rest2 == list(range(10))
+
+
+def test_replay_buffer_unpicklable_elements_raise():
+    # Assign
+    source = iter([threading.Lock() for _ in range(6)])
+    buffer = ReplayBuffer(source, max_elements=2, spill=True, chunk_size=2)
+
+    # Act & Assert
+    with pytest.raises(TypeError):
+        list(buffer)
+    with pytest.raises(RuntimeError):
+        list(buffer)
+
+
+def test_replay_buffer_discarded_beyond_max_elements():
+    # Assign
+    buffer = ReplayBuffer(iter(range(100)), max_elements=10, chunk_size=4)
+    iterator1 = iter(buffer)
+    iterator2 = iter(buffer)
+    head = [next(iterator2) for _ in range(3)]
+
+    # Act
+    result = list(iterator1)
+
+    # Assert
+    assert head == [0, 1, 2]
+    assert result == list(range(100))
+    with pytest.raises(RuntimeError):
+        next(iterator2)
+    with pytest.raises(RuntimeError):
+        iter(buffer)
+
+
+def test_replay_buffer_bounded_read_ahead():
+    # Assign
+    consumed = []
+
+    def source():
+        for x in range(1000):
+            consumed.append(x)
+            yield x
+
+    buffer = ReplayBuffer(source())
+
+    # Act
+    iterator = iter(buffer)
+    head = [next(iterator) for _ in range(400)]
+
+    # Assert
+    assert head == list(range(400))
+    assert len(consumed) <= 400 + 400 // 8 + 1
+
+
+def test_replay_buffer_error_keeps_elements_read_before():
+    # Assign
+    def source():
+        yield from range(20)
+        raise RuntimeError()
+
+    buffer = ReplayBuffer(source(), chunk_size=8)
+    result = []
+
+    # Act
+    with pytest.raises(RuntimeError):
+        for x in buffer:
+            result.append(x)
+
+    # Assert
+    assert result == list(range(20))
+    assert list(buffer) == list(range(20))